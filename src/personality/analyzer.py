@@ -64,8 +64,11 @@ LANGUAGE_CONFIGS = {
     },
 }
 
+# Extension -> language name, flattened from LANGUAGE_CONFIGS for per-file lookups
+LANGUAGES_BY_EXT = {ext: config["language"] for ext, config in LANGUAGE_CONFIGS.items()}
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class Symbol:
     """A code symbol (function, class, method)."""
 
@@ -78,7 +81,7 @@ class Symbol:
     parent: str | None = None  # For methods, the class name
 
 
-@dataclass
+@dataclass(slots=True)
 class AnalysisResult:
     """Result of analyzing a source file."""
 
@@ -123,6 +126,16 @@ def analyze_python(content: str, path: str) -> AnalysisResult:
     try:
         tree = ast.parse(content)
 
+        # Map each function to its enclosing class once, instead of re-walking
+        # the tree per method. ast.walk is breadth-first, so setdefault keeps
+        # the outermost class, as the per-method search did.
+        parent_classes: dict[ast.AST, str] = {}
+        for class_node in ast.walk(tree):
+            if isinstance(class_node, ast.ClassDef):
+                for child in ast.walk(class_node):
+                    if isinstance(child, ast.FunctionDef):
+                        parent_classes.setdefault(child, class_node.name)
+
         for node in ast.walk(tree):
             if isinstance(node, ast.FunctionDef):
                 # Get signature
@@ -147,12 +160,7 @@ def analyze_python(content: str, path: str) -> AnalysisResult:
                 kind = "function"
                 if args and args[0] in ("self", "cls"):
                     kind = "method"
-                    # Find parent class
-                    for parent_node in ast.walk(tree):
-                        if isinstance(parent_node, ast.ClassDef):
-                            if node in ast.walk(parent_node):
-                                parent = parent_node.name
-                                break
+                    parent = parent_classes.get(node)
 
                 result.symbols.append(
                     Symbol(
@@ -214,25 +222,22 @@ def analyze_python(content: str, path: str) -> AnalysisResult:
 
 def analyze_file(path: Path) -> AnalysisResult | None:
     """Analyze a source file and extract symbols, imports, calls."""
-    if not path.exists() or not path.is_file():
+    # Resolve the language from the suffix before touching the filesystem
+    language = LANGUAGES_BY_EXT.get(path.suffix.lower())
+    if language is None or not path.is_file():  # is_file() is False for missing paths too
         return None
 
-    ext = path.suffix.lower()
-
     # Currently only Python has full analysis
-    if ext == ".py":
+    if language == "python":
         content = path.read_text(errors="ignore")
         return analyze_python(content, str(path))
 
     # For other languages, return basic info (tree-sitter can be added later)
-    if ext in LANGUAGE_CONFIGS:
-        return AnalysisResult(
-            path=str(path),
-            language=LANGUAGE_CONFIGS[ext]["language"],
-            errors=["Full analysis not yet implemented for this language"],
-        )
-
-    return None
+    return AnalysisResult(
+        path=str(path),
+        language=language,
+        errors=["Full analysis not yet implemented for this language"],
+    )
 
 
 def generate_symbol_id(path: str, symbol_name: str, kind: str) -> str:
@@ -443,12 +443,13 @@ def import_memories(
 
     def get_embedding(text: str) -> list[float]:
         """Get embedding via Ollama API."""
-        url = f"{ollama_cfg.url}/api/embeddings"
-        data = json.dumps({"model": ollama_cfg.embedding_model, "prompt": text}).encode()
+        # Same endpoint as the memory server, which embeds the recall queries
+        url = f"{ollama_cfg.url}/api/embed"
+        data = json.dumps({"model": ollama_cfg.embedding_model, "input": [text]}).encode()
         req = Request(url, data=data, headers={"Content-Type": "application/json"})
         with urlopen(req, timeout=30) as resp:
             result = json.loads(resp.read().decode())
-            return result["embedding"]
+            return result["embeddings"][0]
 
     # Import memories
     imported = 0
@@ -5,6 +5,7 @@ import os
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Any
 
 import typer
 from rich.console import Console
@@ -12,6 +13,11 @@ from rich.console import Console
 from personality.services.cart_registry import CartRegistry
 from personality.services.persona_builder import PersonaBuilder
 
+try:
+    import orjson
+except ImportError:  # optional speedup, fall back to the stdlib
+    orjson = None  # type: ignore[assignment]
+
 app = typer.Typer(invoke_without_command=True)
 console = Console()
 
@@ -40,11 +46,9 @@ def _load_logging_config() -> dict:
     if _logging_config is not None:
         return _logging_config
 
-    config = {
-        "max_length": DEFAULT_MAX_LEN,
-        "preserve_fields": DEFAULT_PRESERVE_FIELDS.copy(),
-        "preserve_suffixes": DEFAULT_PRESERVE_SUFFIXES.copy(),
-    }
+    max_length: int = DEFAULT_MAX_LEN
+    preserve_fields: list[str] = DEFAULT_PRESERVE_FIELDS.copy()
+    preserve_suffixes: list[str] = DEFAULT_PRESERVE_SUFFIXES.copy()
 
     if LOGGING_CONFIG_FILE.exists():
         try:
@@ -55,14 +59,21 @@ def _load_logging_config() -> dict:
             if "truncation" in file_config:
                 t = file_config["truncation"]
                 if "max_length" in t:
-                    config["max_length"] = t["max_length"]
+                    max_length = t["max_length"]
                 if "preserve_fields" in t:
-                    config["preserve_fields"] = t["preserve_fields"]
+                    preserve_fields = t["preserve_fields"]
                 if "preserve_suffixes" in t:
-                    config["preserve_suffixes"] = t["preserve_suffixes"]
+                    preserve_suffixes = t["preserve_suffixes"]
         except Exception:
             pass  # Use defaults on error
 
+    # Normalized once here rather than on every key of every hook payload
+    config = {
+        "max_length": max_length,
+        "preserve_fields": frozenset(preserve_fields),
+        "preserve_suffixes": tuple(suffix.lower() for suffix in preserve_suffixes),
+    }
+
     _logging_config = config
     return config
 
@@ -81,16 +92,8 @@ def _is_preserved_key(key: str) -> bool:
     cfg = _load_logging_config()
     key_lower = key.lower()
 
-    # Check exact match
-    if key_lower in cfg["preserve_fields"]:
-        return True
-
-    # Check suffix match
-    for suffix in cfg["preserve_suffixes"]:
-        if key_lower.endswith(suffix.lower()):
-            return True
-
-    return False
+    # Exact match, or any suffix in a single endswith call
+    return key_lower in cfg["preserve_fields"] or key_lower.endswith(cfg["preserve_suffixes"])
 
 
 def _process_value(key: str, value: any) -> any:
@@ -117,11 +120,20 @@ def _process_value(key: str, value: any) -> any:
     return _truncate(str(value))
 
 
+def _load_stdin() -> Any:
+    """Parse stdin as JSON, raising json.JSONDecodeError on invalid input."""
+    # Raw bytes: both parsers accept UTF-8 directly, skipping the text layer
+    data = sys.stdin.buffer.read()
+    if orjson is not None:
+        return orjson.loads(data)  # orjson.JSONDecodeError subclasses json.JSONDecodeError
+    return json.loads(data)
+
+
 def _read_stdin_json() -> dict | None:
     """Read JSON from stdin if available."""
     try:
         if not sys.stdin.isatty():
-            return json.load(sys.stdin)
+            return _load_stdin()
     except (json.JSONDecodeError, EOFError):
         pass
     return None
@@ -221,7 +233,7 @@ def pre_tool_use_require_read() -> None:
     """
     # Read tool input from stdin
     try:
-        tool_input = json.load(sys.stdin)
+        tool_input = _load_stdin()
     except (json.JSONDecodeError, EOFError):
         _log_hook("PreToolUse", {"tool": "Write", "cmd": "require-read"})
         return  # No input, allow
@@ -274,7 +286,7 @@ def post_tool_use_track_read() -> None:
     """
     # Read tool input from stdin
     try:
-        tool_input = json.load(sys.stdin)
+        tool_input = _load_stdin()
     except (json.JSONDecodeError, EOFError):
         _log_hook("PostToolUse", {"tool": "Read", "cmd": "track-read"})
         return  # No input, nothing to track
@@ -4,7 +4,6 @@ import hashlib
 import json
 import sys
 import time
-from datetime import UTC, datetime
 from pathlib import Path
 
 import typer
@@ -307,6 +306,7 @@ def index_docs(
     path: str = typer.Argument(".", help="Directory to index"),
     project: str = typer.Option(None, "--project", "-p", help="Project name (default: directory name)"),
     dry_run: bool = typer.Option(False, "--dry-run", "-n", help="Show files without indexing"),
+    force: bool = typer.Option(False, "--force", "-f", help="Re-index files even if unchanged"),
 ) -> None:
     """Index documentation files (.md, .txt, .rst, .adoc) for semantic search."""
     try:
@@ -319,16 +319,7 @@ def index_docs(
             raise typer.Exit(1)
 
         # Collect files to index
-        files_to_index = []
-        for file_path in base_path.rglob("*"):
-            if not file_path.is_file():
-                continue
-            if file_path.suffix.lower() not in DOC_EXTENSIONS:
-                continue
-            # Skip hidden directories
-            if any(p.startswith(".") for p in file_path.relative_to(base_path).parts):
-                continue
-            files_to_index.append(file_path)
+        files_to_index = list(indexer.discover_files(base_path, DOC_EXTENSIONS))
 
         if not files_to_index:
             console.print("[yellow]No documentation files found[/yellow]")
@@ -351,6 +342,14 @@ def index_docs(
         # Ensure schema exists
         indexer.ensure_schema(conn)
 
+        # Drop unchanged files, checked against one preloaded path -> indexed_at map
+        skipped = 0
+        if not force:
+            indexed_times = indexer.get_indexed_times(conn, "doc_index", project_name)
+            changed = [f for f in files_to_index if not indexer.is_current(f, indexed_times)]
+            skipped = len(files_to_index) - len(changed)
+            files_to_index = changed
+
         indexed_chunks = 0
         error_count = 0
         start_time = time.time()
@@ -369,33 +368,43 @@ def index_docs(
 
             for file_path in files_to_index:
                 try:
-                    content = file_path.read_text(errors="ignore")
+                    content = indexer.read_source(file_path)
                     if len(content) < 10:
                         progress.advance(task)
                         continue
 
                     # Chunk content
                     chunks = list(indexer.chunk_content(content))
-                    for i, chunk in enumerate(chunks):
-                        chunk_id = hashlib.md5(f"{file_path}:{i}".encode()).hexdigest()
-                        embedding = indexer.get_embedding(chunk)
+                    embeddings = indexer.get_embeddings(chunks)
+                    rows = [
+                        (
+                            hashlib.md5(f"{file_path}:{i}".encode()).hexdigest(),
+                            str(file_path),
+                            chunk,
+                            embedding,
+                            project_name,
+                        )
+                        for i, (chunk, embedding) in enumerate(zip(chunks, embeddings, strict=True))
+                    ]
 
-                        with conn.cursor() as cur:
-                            cur.execute(
-                                """
-                                INSERT INTO doc_index (id, path, content, embedding, project)
-                                VALUES (%s, %s, %s, %s, %s)
-                                ON CONFLICT (id) DO UPDATE SET
-                                    content = EXCLUDED.content,
-                                    embedding = EXCLUDED.embedding,
-                                    indexed_at = NOW()
-                                """,
-                                (chunk_id, str(file_path), chunk, embedding, project_name),
-                            )
-                        conn.commit()
-                        indexed_chunks += 1
+                    # All of a file's chunks in one statement batch and one transaction
+                    with conn.cursor() as cur:
+                        cur.executemany(
+                            """
+                            INSERT INTO doc_index (id, path, content, embedding, project)
+                            VALUES (%s, %s, %s, %s, %s)
+                            ON CONFLICT (id) DO UPDATE SET
+                                content = EXCLUDED.content,
+                                embedding = EXCLUDED.embedding,
+                                indexed_at = NOW()
+                            """,
+                            rows,
+                        )
+                    conn.commit()
+                    indexed_chunks += len(rows)
 
                 except Exception as e:
+                    conn.rollback()
                     error_count += 1
                     progress.console.print(f"[red]✗[/red] {file_path.name}: {e}")
 
@@ -404,6 +413,8 @@ def index_docs(
         conn.close()
         elapsed = time.time() - start_time
         console.print(f"\n[green]✓[/green] Indexed [bold]{indexed_chunks}[/bold] chunks from [bold]{len(files_to_index)}[/bold] files in [bold]{elapsed:.1f}s[/bold]")
+        if skipped:
+            console.print(f"[dim]Skipped {skipped} unchanged files[/dim]")
         if error_count:
             console.print(f"[yellow]⚠[/yellow] {error_count} errors")
         console.print(f"[dim]Project: {project_name}[/dim]")
@@ -422,6 +433,7 @@ def index_code_cmd(
     extensions: str = typer.Option(None, "--ext", "-e", help="Comma-separated extensions (e.g., .py,.rs)"),
     analyze: bool = typer.Option(True, "--analyze/--no-analyze", help="Run AST analysis"),
     dry_run: bool = typer.Option(False, "--dry-run", "-n", help="Show files without indexing"),
+    force: bool = typer.Option(False, "--force", "-f", help="Re-index files even if unchanged"),
 ) -> None:
     """Index code files for semantic search with optional AST analysis."""
     try:
@@ -438,18 +450,8 @@ def index_code_cmd(
         if extensions:
             ext_set = {e.strip() if e.startswith(".") else f".{e.strip()}" for e in extensions.split(",")}
 
-        # Collect files to index
-        files_to_index = []
-        for file_path in base_path.rglob("*"):
-            if not file_path.is_file():
-                continue
-            if file_path.suffix.lower() not in ext_set:
-                continue
-            # Skip hidden and vendor directories
-            rel_parts = file_path.relative_to(base_path).parts
-            if any(p.startswith(".") or p in ("node_modules", "vendor", "__pycache__", "target", ".git") for p in rel_parts):
-                continue
-            files_to_index.append(file_path)
+        # Collect files to index, skipping hidden and vendor directories
+        files_to_index = list(indexer.discover_files(base_path, ext_set, indexer.VENDOR_DIRS))
 
         if not files_to_index:
             console.print("[yellow]No code files found[/yellow]")
@@ -473,6 +475,14 @@ def index_code_cmd(
         indexer.ensure_schema(conn)
         ensure_symbols_table(conn)
 
+        # Drop unchanged files, checked against one preloaded path -> indexed_at map
+        skipped = 0
+        if not force:
+            indexed_times = indexer.get_indexed_times(conn, "code_index", project_name)
+            changed = [f for f in files_to_index if not indexer.is_current(f, indexed_times)]
+            skipped = len(files_to_index) - len(changed)
+            files_to_index = changed
+
         indexed_chunks = 0
         symbols_count = 0
         error_count = 0
@@ -492,7 +502,7 @@ def index_code_cmd(
 
             for file_path in files_to_index:
                 try:
-                    content = file_path.read_text(errors="ignore")
+                    content = indexer.read_source(file_path)
                     if len(content) < 10:
                         progress.advance(task)
                         continue
@@ -501,78 +511,88 @@ def index_code_cmd(
 
                     # Chunk and index content
                     chunks = list(indexer.chunk_content(content))
-                    for i, chunk in enumerate(chunks):
-                        chunk_id = hashlib.md5(f"{file_path}:{i}".encode()).hexdigest()
-                        embedding = indexer.get_embedding(chunk)
+                    embeddings = indexer.get_embeddings(chunks)
+                    chunk_rows = [
+                        (
+                            hashlib.md5(f"{file_path}:{i}".encode()).hexdigest(),
+                            str_path,
+                            chunk,
+                            embedding,
+                            file_path.suffix,
+                            project_name,
+                        )
+                        for i, (chunk, embedding) in enumerate(zip(chunks, embeddings, strict=True))
+                    ]
+
+                    # All of a file's writes go in batched statements and commit once, below
+                    with conn.cursor() as cur:
+                        cur.executemany(
+                            """
+                            INSERT INTO code_index (id, path, content, embedding, language, project)
+                            VALUES (%s, %s, %s, %s, %s, %s)
+                            ON CONFLICT (id) DO UPDATE SET
+                                content = EXCLUDED.content,
+                                embedding = EXCLUDED.embedding,
+                                indexed_at = NOW()
+                            """,
+                            chunk_rows,
+                        )
+
+                    # AST analysis
+                    result = analyze_file(file_path) if analyze else None
+                    if result and not result.errors:
+                        # Embed all of the file's symbols in one batch
+                        sym_texts = [f"{sym.signature}\n{sym.docstring or ''}" for sym in result.symbols]
+                        sym_embeddings = indexer.get_embeddings(sym_texts)
+                        sym_rows = [
+                            (
+                                generate_symbol_id(str_path, sym.name, sym.kind),
+                                str_path,
+                                sym.name,
+                                sym.kind,
+                                sym.signature,
+                                sym.start_line,
+                                sym.end_line,
+                                (sym.docstring or "")[:2000],
+                                sym.parent or "",
+                                project_name,
+                                sym_embedding,
+                            )
+                            for sym, sym_embedding in zip(result.symbols, sym_embeddings, strict=True)
+                        ]
 
                         with conn.cursor() as cur:
-                            cur.execute(
+                            # Clear old data
+                            cur.execute("DELETE FROM symbols WHERE path = %s", (str_path,))
+                            cur.execute("DELETE FROM imports WHERE source_path = %s", (str_path,))
+                            cur.execute("DELETE FROM calls WHERE source_path = %s", (str_path,))
+
+                            cur.executemany(
                                 """
-                                INSERT INTO code_index (id, path, content, embedding, language, project)
-                                VALUES (%s, %s, %s, %s, %s, %s)
+                                INSERT INTO symbols (id, path, name, kind, signature, start_line, end_line, docstring, parent, project, embedding)
+                                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
                                 ON CONFLICT (id) DO UPDATE SET
-                                    content = EXCLUDED.content,
+                                    signature = EXCLUDED.signature,
                                     embedding = EXCLUDED.embedding,
                                     indexed_at = NOW()
                                 """,
-                                (chunk_id, str_path, chunk, embedding, file_path.suffix, project_name),
+                                sym_rows,
+                            )
+                            cur.executemany(
+                                "INSERT INTO imports (source_path, imported, project) VALUES (%s, %s, %s)",
+                                [(str_path, imp, project_name) for imp in result.imports],
+                            )
+                            cur.executemany(
+                                "INSERT INTO calls (source_path, callee, project) VALUES (%s, %s, %s)",
+                                [(str_path, call, project_name) for call in result.calls],
                             )
-                        conn.commit()
-                        indexed_chunks += 1
+                        symbols_count += len(sym_rows)
 
-                    # AST analysis
-                    if analyze:
-                        result = analyze_file(file_path)
-                        if result and not result.errors:
-                            # Clear old data
-                            with conn.cursor() as cur:
-                                cur.execute("DELETE FROM symbols WHERE path = %s", (str_path,))
-                                cur.execute("DELETE FROM imports WHERE source_path = %s", (str_path,))
-                                cur.execute("DELETE FROM calls WHERE source_path = %s", (str_path,))
-                            conn.commit()
-
-                            # Insert symbols
-                            for sym in result.symbols:
-                                sym_id = generate_symbol_id(str_path, sym.name, sym.kind)
-                                sym_text = f"{sym.signature}\n{sym.docstring or ''}"
-                                sym_embedding = indexer.get_embedding(sym_text)
-
-                                with conn.cursor() as cur:
-                                    cur.execute(
-                                        """
-                                        INSERT INTO symbols (id, path, name, kind, signature, start_line, end_line, docstring, parent, project, embedding)
-                                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                                        ON CONFLICT (id) DO UPDATE SET
-                                            signature = EXCLUDED.signature,
-                                            embedding = EXCLUDED.embedding,
-                                            indexed_at = NOW()
-                                        """,
-                                        (sym_id, str_path, sym.name, sym.kind, sym.signature,
-                                         sym.start_line, sym.end_line, (sym.docstring or "")[:2000],
-                                         sym.parent or "", project_name, sym_embedding),
-                                    )
-                                conn.commit()
-                                symbols_count += 1
-
-                            # Insert imports
-                            for imp in result.imports:
-                                with conn.cursor() as cur:
-                                    cur.execute(
-                                        "INSERT INTO imports (source_path, imported, project) VALUES (%s, %s, %s)",
-                                        (str_path, imp, project_name),
-                                    )
-                                conn.commit()
-
-                            # Insert calls
-                            for call in result.calls:
-                                with conn.cursor() as cur:
-                                    cur.execute(
-                                        "INSERT INTO calls (source_path, callee, project) VALUES (%s, %s, %s)",
-                                        (str_path, call, project_name),
-                                    )
-                                conn.commit()
+                    conn.commit()
+                    indexed_chunks += len(chunk_rows)
 
                 except Exception as e:
+                    conn.rollback()
                     error_count += 1
                     progress.console.print(f"[red]✗[/red] {file_path.name}: {e}")
 
@@ -583,6 +603,8 @@ def index_code_cmd(
         console.print(f"\n[green]✓[/green] Indexed [bold]{indexed_chunks}[/bold] chunks from [bold]{len(files_to_index)}[/bold] files in [bold]{elapsed:.1f}s[/bold]")
         if analyze:
             console.print(f"[green]✓[/green] Analyzed [bold]{symbols_count}[/bold] symbols")
+        if skipped:
+            console.print(f"[dim]Skipped {skipped} unchanged files[/dim]")
         if error_count:
             console.print(f"[yellow]⚠[/yellow] {error_count} errors")
         console.print(f"[dim]Project: {project_name}[/dim]")
@@ -709,7 +731,7 @@ def show_diff(
         indexed_docs = {}
 
         if index_type in ("code", "all"):
-            sql = f"SELECT path, indexed_at FROM code_index WHERE project = '{project_name}'"
+            sql = f"SELECT path, EXTRACT(EPOCH FROM indexed_at::timestamptz) FROM code_index WHERE project = '{project_name}'"
             result = indexer.run_psql(sql)
             if result.get("success") and result.get("stdout"):
                 for line in result["stdout"].strip().split("\n"):
@@ -718,7 +740,7 @@ def show_diff(
                         indexed_code[parts[0]] = parts[1] if len(parts) > 1 else None
 
         if index_type in ("docs", "all"):
-            sql = f"SELECT path, indexed_at FROM doc_index WHERE project = '{project_name}'"
+            sql = f"SELECT path, EXTRACT(EPOCH FROM indexed_at::timestamptz) FROM doc_index WHERE project = '{project_name}'"
             result = indexer.run_psql(sql)
             if result.get("success") and result.get("stdout"):
                 for line in result["stdout"].strip().split("\n"):
@@ -738,20 +760,11 @@ def show_diff(
             extensions.update(indexer.DOC_EXTENSIONS)
 
         current_files = set()
-        for file_path in base_path.rglob("*"):
-            if not file_path.is_file():
-                continue
-            if file_path.suffix.lower() not in extensions:
-                continue
-            # Skip hidden/vendor directories
-            if any(
-                p.startswith(".") or p in ("node_modules", "vendor", "__pycache__", ".git") for p in file_path.parts
-            ):
-                continue
-
+        # Skip hidden/vendor directories
+        for file_path in indexer.discover_files(base_path, extensions, indexer.VENDOR_DIRS):
             str_path = str(file_path)
             current_files.add(str_path)
-            mtime = datetime.fromtimestamp(file_path.stat().st_mtime, tz=UTC)
+            mtime = file_path.stat().st_mtime
 
             # Check if in index
             indexed = indexed_code if file_path.suffix.lower() in indexer.CODE_EXTENSIONS else indexed_docs
@@ -763,10 +776,8 @@ def show_diff(
                 indexed_at_str = indexed[str_path]
                 if indexed_at_str:
                     try:
-                        # Parse PostgreSQL timestamp
-                        indexed_at = datetime.fromisoformat(indexed_at_str.replace(" ", "T").split(".")[0])
-                        indexed_at = indexed_at.replace(tzinfo=UTC)
-                        if mtime > indexed_at:
+                        # indexed_at comes back as epoch seconds, already time zone aware
+                        if mtime > float(indexed_at_str):
                             modified_files.append(str_path)
                     except (ValueError, TypeError):
                         modified_files.append(str_path)
@@ -830,7 +841,7 @@ def sync_index(
         # Get indexed files with timestamps
         indexed = {}
         for table in ("code_index", "doc_index"):
-            sql = f"SELECT path, indexed_at FROM {table} WHERE project = '{project_name}'"
+            sql = f"SELECT path, EXTRACT(EPOCH FROM indexed_at::timestamptz) FROM {table} WHERE project = '{project_name}'"
             result = indexer.run_psql(sql)
             if result.get("success") and result.get("stdout"):
                 for line in result["stdout"].strip().split("\n"):
@@ -842,18 +853,9 @@ def sync_index(
         to_index = []
         extensions = indexer.CODE_EXTENSIONS | indexer.DOC_EXTENSIONS
 
-        for file_path in base_path.rglob("*"):
-            if not file_path.is_file():
-                continue
-            if file_path.suffix.lower() not in extensions:
-                continue
-            if any(
-                p.startswith(".") or p in ("node_modules", "vendor", "__pycache__", ".git") for p in file_path.parts
-            ):
-                continue
-
+        for file_path in indexer.discover_files(base_path, extensions, indexer.VENDOR_DIRS):
             str_path = str(file_path)
-            mtime = datetime.fromtimestamp(file_path.stat().st_mtime, tz=UTC)
+            mtime = file_path.stat().st_mtime
 
             if str_path not in indexed:
                 to_index.append(file_path)
@@ -861,9 +863,7 @@ def sync_index(
                 indexed_at_str = indexed[str_path]
                 if indexed_at_str:
                     try:
-                        indexed_at = datetime.fromisoformat(indexed_at_str.replace(" ", "T").split(".")[0])
-                        indexed_at = indexed_at.replace(tzinfo=UTC)
-                        if mtime > indexed_at:
+                        if mtime > float(indexed_at_str):
                             to_index.append(file_path)
                     except (ValueError, TypeError):
                         to_index.append(file_path)
@@ -259,8 +259,7 @@ def hook_stop() -> None:
         lines = transcript.read_text().strip().split("\n")
         recent = lines[-20:] if len(lines) > 20 else lines
 
-        service = get_service()
-        extracted = 0
+        found: list[tuple[str, str, str]] = []
 
         for line in recent:
             try:
@@ -298,21 +297,15 @@ def hook_stop() -> None:
                                 subject = parts[0].strip()
                                 obj = parts[1].strip().rstrip(".")
                                 if subject and obj and len(subject) < 50 and len(obj) < 100:
-                                    service.add(
-                                        subject=subject,
-                                        predicate=predicate,
-                                        obj=obj,
-                                        source="session-hook",
-                                        confidence=0.7,
-                                    )
-                                    extracted += 1
+                                    found.append((subject, predicate, obj))
                             break
 
             except json.JSONDecodeError:
                 continue
 
-        if extracted > 0:
-            print(json.dumps({"knowledge_extracted": extracted}))
+        if found:
+            get_service().add_many(found, source="session-hook", confidence=0.7)
+            print(json.dumps({"knowledge_extracted": len(found)}))
 
     except (json.JSONDecodeError, KeyError):
         pass
@@ -5,7 +5,9 @@ A .pcart file is a ZIP archive containing:
 - preferences.yml: User preferences (never overwritten)
 """
 
+import re
 from datetime import datetime
+from functools import cached_property
 from pathlib import Path
 from typing import Any
 
@@ -13,6 +15,9 @@ from pydantic import BaseModel, Field
 
 from personality.schemas.training import TrainingMemory
 
+# Memory subjects holding a persona's greeting template
+_GREETING_SUBJECT_RE = re.compile(r"greeting|salutation", re.IGNORECASE)
+
 
 class IdentityConfig(BaseModel):
     """Identity configuration from persona.yml."""
@@ -79,6 +84,14 @@ class PersonaConfig(BaseModel):
         """Number of memories."""
         return len(self.memories)
 
+    @cached_property
+    def greeting_template(self) -> str | None:
+        """Content of the first greeting/salutation memory, looked up once per loaded persona."""
+        for mem in self.memories:
+            if _GREETING_SUBJECT_RE.search(mem.subject):
+                return mem.content
+        return None
+
 
 class CartManifest(BaseModel):
     """Manifest metadata for a cartridge."""
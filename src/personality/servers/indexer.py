@@ -7,15 +7,20 @@ Uses Ollama for embeddings and PostgreSQL/pgvector for storage.
 import hashlib
 import json
 import logging
+import os
+import threading
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
-from urllib.request import Request, urlopen
-from urllib.error import URLError
 
+import httpx
 import psycopg
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import TextContent, Tool
+from pgvector import Vector
 from pgvector.psycopg import register_vector
 
 from personality.config import get_config
@@ -29,18 +34,59 @@ server = Server("indexer")
 CODE_EXTENSIONS = {".py", ".rs", ".rb", ".js", ".ts", ".go", ".java", ".c", ".cpp", ".h"}
 DOC_EXTENSIONS = {".md", ".txt", ".rst", ".adoc"}
 
+# Directories never descended into when indexing code (hidden ones are always skipped)
+VENDOR_DIRS = frozenset({"node_modules", "vendor", "__pycache__", "target"})
+
+# Chunks sent to Ollama per embedding request
+EMBED_BATCH_SIZE = 64
+
+# Larger files (generated, minified or data) are not indexed
+MAX_FILE_SIZE = 1_000_000
+
+# Files read, chunked and embedded concurrently while database writes stay serial
+INDEX_WORKERS = 4
+
+
+# Shared Ollama client, so embedding requests reuse one keep-alive connection
+_ollama_client: httpx.Client | None = None
+_ollama_client_lock = threading.Lock()
+
+# Shared database connection, opened on the first tool call
+_connection: psycopg.Connection | None = None
+
+# Set once ensure_schema() has run in this process
+_schema_ready = False
+
+
+def get_ollama_client() -> httpx.Client:
+    """Get the shared httpx client for Ollama, creating it on first use."""
+    global _ollama_client
+    if _ollama_client is None:
+        # Embedding worker threads can race here on first use; only one may build the client
+        with _ollama_client_lock:
+            if _ollama_client is None:
+                _ollama_client = httpx.Client(base_url=get_config().ollama.url, timeout=30.0)
+    return _ollama_client
+
 
 def get_connection() -> psycopg.Connection:
-    """Get a PostgreSQL connection."""
-    cfg = get_config().postgres
-    conn = psycopg.connect(
-        host=cfg.host,
-        port=cfg.port,
-        dbname=cfg.database,
-        user=cfg.user,
-    )
-    register_vector(conn)
-    return conn
+    """
+    Get the shared PostgreSQL connection, reconnecting if it was closed.
+
+    Tool calls reuse one session, so psycopg's server-side prepared
+    statements for repeated queries (such as search) survive between calls.
+    """
+    global _connection
+    if _connection is None or _connection.closed:
+        cfg = get_config().postgres
+        _connection = psycopg.connect(
+            host=cfg.host,
+            port=cfg.port,
+            dbname=cfg.database,
+            user=cfg.user,
+        )
+        register_vector(_connection)
+    return _connection
 
 
 def get_embedding(text: str) -> list[float]:
@@ -49,15 +95,13 @@ def get_embedding(text: str) -> list[float]:
     # Truncate to avoid token limits
     truncated = text[:8000]
 
-    url = f"{cfg.url}/api/embeddings"
-    data = json.dumps({"model": cfg.embedding_model, "prompt": truncated}).encode()
-
     try:
-        req = Request(url, data=data, headers={"Content-Type": "application/json"})
-        with urlopen(req, timeout=30) as resp:
-            result = json.loads(resp.read().decode())
-            return result["embedding"]
-    except URLError as e:
+        # Same endpoint as get_embeddings, so queries and indexed chunks are embedded alike
+        response = get_ollama_client().post("/api/embed", json={"model": cfg.embedding_model, "input": [truncated]})
+        response.raise_for_status()
+        result = response.json()
+        return result["embeddings"][0]
+    except httpx.HTTPError as e:
         logger.error(f"Ollama embedding failed: {e}")
         raise
     except KeyError:
@@ -65,8 +109,44 @@ def get_embedding(text: str) -> list[float]:
         raise
 
 
+def get_embeddings(texts: list[str]) -> list[Vector]:
+    """Get embeddings for several texts, batching them into few Ollama API calls.
+
+    Returned as pgvector Vectors (packed float32), which psycopg sends in
+    binary instead of as float8 arrays cast server-side.
+    """
+    cfg = get_config().ollama
+    client = get_ollama_client()
+    embeddings: list[Vector] = []
+
+    for start in range(0, len(texts), EMBED_BATCH_SIZE):
+        # Truncate to avoid token limits
+        batch = [text[:8000] for text in texts[start : start + EMBED_BATCH_SIZE]]
+
+        try:
+            response = client.post("/api/embed", json={"model": cfg.embedding_model, "input": batch}, timeout=120.0)
+            response.raise_for_status()
+            result = response.json()
+            embeddings.extend(Vector(embedding) for embedding in result["embeddings"])
+        except httpx.HTTPError as e:
+            logger.error(f"Ollama embedding failed: {e}")
+            raise
+        except KeyError:
+            logger.error(f"Unexpected Ollama response: {result}")
+            raise
+
+    return embeddings
+
+
 def ensure_schema(conn: psycopg.Connection) -> None:
-    """Ensure the index tables exist."""
+    """Ensure the index tables exist.
+
+    The DDL runs once per process; later calls return immediately.
+    """
+    global _schema_ready
+    if _schema_ready:
+        return
+
     with conn.cursor() as cur:
         cur.execute("CREATE EXTENSION IF NOT EXISTS vector")
         cur.execute("""
@@ -98,7 +178,93 @@ def ensure_schema(conn: psycopg.Connection) -> None:
             CREATE INDEX IF NOT EXISTS doc_embedding_idx
             ON doc_index USING ivfflat (embedding vector_cosine_ops)
         """)
+        # Cover the per-project lookups (status counts, change detection, clear)
+        # so they read the index instead of scanning rows with wide embeddings
+        cur.execute("CREATE INDEX IF NOT EXISTS code_project_path_idx ON code_index (project, path, indexed_at)")
+        cur.execute("CREATE INDEX IF NOT EXISTS doc_project_path_idx ON doc_index (project, path, indexed_at)")
     conn.commit()
+    _schema_ready = True
+
+
+def discover_files(root: Path, extensions: set[str], skip_dirs: frozenset[str] = frozenset()) -> Iterator[Path]:
+    """
+    Yield files under root with one of the given extensions, skipping hidden files and directories.
+
+    Extensions match case-insensitively. The CLI index commands walk trees
+    through this too, so both pick the same files.
+    """
+    wanted = {ext.lower() for ext in extensions}
+    for dirpath, dirnames, filenames in os.walk(root):
+        # Prune in place so os.walk never lists the skipped subtrees
+        dirnames[:] = [d for d in dirnames if not d.startswith(".") and d not in skip_dirs]
+        for name in filenames:
+            if not name.startswith(".") and os.path.splitext(name)[1].lower() in wanted:
+                yield Path(dirpath, name)
+
+
+def read_source(file_path: Path) -> str:
+    """Read a file for indexing as UTF-8 text, or return "" if it is over MAX_FILE_SIZE."""
+    if file_path.stat().st_size > MAX_FILE_SIZE:
+        return ""
+    # One read and one decode, rather than streaming through a text wrapper
+    return file_path.read_bytes().decode("utf-8", errors="ignore")
+
+
+def prepare_files(files: list[Path]) -> Iterator[tuple[Path, tuple[list[str], list[Vector]] | Exception]]:
+    """
+    Read, chunk and embed files on a thread pool, yielding them in input order.
+
+    Embedding waits on Ollama, so several files are in flight while the caller
+    writes finished ones; only a few results are buffered ahead of it. Files
+    too short to index yield empty lists, and a failed file yields its exception.
+    """
+
+    def prepare(file_path: Path) -> tuple[list[str], list[Vector]] | Exception:
+        try:
+            content = read_source(file_path)
+            if len(content) < 10:
+                return [], []
+            chunks = chunk_content(content)
+            return chunks, get_embeddings(chunks)
+        except Exception as e:
+            return e
+
+    # At most 2 * INDEX_WORKERS files submitted and not yet yielded, oldest first
+    pending: deque[tuple[Path, Future[tuple[list[str], list[Vector]] | Exception]]] = deque()
+    with ThreadPoolExecutor(max_workers=INDEX_WORKERS) as pool:
+        for file_path in files:
+            if len(pending) >= 2 * INDEX_WORKERS:
+                done_path, future = pending.popleft()
+                yield done_path, future.result()
+            pending.append((file_path, pool.submit(prepare, file_path)))
+
+        while pending:
+            done_path, future = pending.popleft()
+            yield done_path, future.result()
+
+
+def get_indexed_times(conn: psycopg.Connection, table: str, project: str) -> dict[str, float]:
+    """
+    Map each indexed path of a project to when it was last indexed, in epoch seconds.
+
+    indexed_at is a naive TIMESTAMP filled by NOW() in the session time zone,
+    so the cast to timestamptz reads it back in that zone before taking the epoch.
+    """
+    with conn.cursor() as cur:
+        cur.execute(
+            f"SELECT path, EXTRACT(EPOCH FROM MAX(indexed_at)::timestamptz) FROM {table} "
+            "WHERE project = %s GROUP BY path",
+            (project,),
+        )
+        return {path: float(epoch) for path, epoch in cur.fetchall() if epoch is not None}
+
+
+def is_current(file_path: Path, indexed: dict[str, float]) -> bool:
+    """Check whether a file is unchanged since it was last indexed, from its mtime alone."""
+    indexed_at = indexed.get(str(file_path))
+    if indexed_at is None:
+        return False
+    return file_path.stat().st_mtime <= indexed_at
 
 
 def chunk_content(content: str, chunk_size: int = 2000, overlap: int = 200) -> list[str]:
@@ -106,15 +272,8 @@ def chunk_content(content: str, chunk_size: int = 2000, overlap: int = 200) -> l
     if len(content) <= chunk_size:
         return [content]
 
-    chunks = []
-    start = 0
-    while start < len(content):
-        end = start + chunk_size
-        chunk = content[start:end]
-        chunks.append(chunk)
-        start = end - overlap
-
-    return chunks
+    # Window starts are fixed by the step, so slice them all in one comprehension
+    return [content[start : start + chunk_size] for start in range(0, len(content), chunk_size - overlap)]
 
 
 @server.list_tools()
@@ -134,6 +293,7 @@ async def list_tools() -> list[Tool]:
                         "items": {"type": "string"},
                         "description": "File extensions to include",
                     },
+                    "force": {"type": "boolean", "description": "Re-index files even if unchanged"},
                 },
                 "required": ["path"],
             },
@@ -146,6 +306,7 @@ async def list_tools() -> list[Tool]:
                 "properties": {
                     "path": {"type": "string", "description": "Directory path to index"},
                     "project": {"type": "string", "description": "Project name"},
+                    "force": {"type": "boolean", "description": "Re-index files even if unchanged"},
                 },
                 "required": ["path"],
             },
@@ -197,24 +358,30 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
     """Handle tool calls."""
     logger.info(f"Tool called: {name} with {arguments}")
 
+    conn = None
     try:
-        with get_connection() as conn:
-            ensure_schema(conn)
-
-            if name == "index_code":
-                result = index_code(conn, arguments)
-            elif name == "index_docs":
-                result = index_docs(conn, arguments)
-            elif name == "search":
-                result = search_index(conn, arguments)
-            elif name == "status":
-                result = get_status(conn, arguments)
-            elif name == "clear":
-                result = clear_index(conn, arguments)
-            else:
-                result = {"error": f"Unknown tool: {name}"}
+        conn = get_connection()
+        ensure_schema(conn)
+
+        if name == "index_code":
+            result = index_code(conn, arguments)
+        elif name == "index_docs":
+            result = index_docs(conn, arguments)
+        elif name == "search":
+            result = search_index(conn, arguments)
+        elif name == "status":
+            result = get_status(conn, arguments)
+        elif name == "clear":
+            result = clear_index(conn, arguments)
+        else:
+            result = {"error": f"Unknown tool: {name}"}
+
+        # End the call's transaction but keep the session open for the next call
+        conn.commit()
 
     except Exception as e:
+        if conn is not None and not conn.closed:
+            conn.rollback()
         logger.exception(f"Error in tool {name}")
         result = {"success": False, "error": str(e)}
 
@@ -227,41 +394,64 @@ def index_code(conn: psycopg.Connection, arguments: dict[str, Any]) -> dict[str,
     project = arguments.get("project", path.name)
     extensions = set(arguments.get("extensions", CODE_EXTENSIONS))
 
+    # Compare mtimes against the last index run before reading any file
+    indexed_times = {} if arguments.get("force") else get_indexed_times(conn, "code_index", project)
+
     indexed = 0
+    skipped = 0
     errors = []
 
-    for file_path in path.rglob("*"):
-        if file_path.suffix not in extensions or not file_path.is_file():
-            continue
+    pending = []
+    for file_path in discover_files(path, extensions, VENDOR_DIRS):
+        try:
+            if is_current(file_path, indexed_times):
+                skipped += 1
+            else:
+                pending.append(file_path)
+        except OSError as e:
+            errors.append(f"{file_path}: {e}")
 
+    for file_path, prepared in prepare_files(pending):
         try:
-            content = file_path.read_text(errors="ignore")
-            if len(content) < 10:
+            if isinstance(prepared, Exception):
+                raise prepared
+            chunks, embeddings = prepared
+            if not chunks:
                 continue
 
-            for i, chunk in enumerate(chunk_content(content)):
-                chunk_id = hashlib.md5(f"{file_path}:{i}".encode()).hexdigest()
-                embedding = get_embedding(chunk)
-
-                with conn.cursor() as cur:
-                    cur.execute(
-                        """
-                        INSERT INTO code_index (id, path, content, embedding, language, project)
-                        VALUES (%s, %s, %s, %s, %s, %s)
-                        ON CONFLICT (id) DO UPDATE SET
-                            content = EXCLUDED.content,
-                            embedding = EXCLUDED.embedding,
-                            indexed_at = NOW()
-                        """,
-                        (chunk_id, str(file_path), chunk, embedding, file_path.suffix, project),
-                    )
-                conn.commit()
-                indexed += 1
+            rows = [
+                (
+                    hashlib.md5(f"{file_path}:{i}".encode()).hexdigest(),
+                    str(file_path),
+                    chunk,
+                    embedding,
+                    file_path.suffix,
+                    project,
+                )
+                for i, (chunk, embedding) in enumerate(zip(chunks, embeddings, strict=True))
+            ]
+
+            # All of a file's chunks in one statement batch and one transaction
+            with conn.cursor() as cur:
+                cur.executemany(
+                    """
+                    INSERT INTO code_index (id, path, content, embedding, language, project)
+                    VALUES (%s, %s, %s, %s, %s, %s)
+                    ON CONFLICT (id) DO UPDATE SET
+                        content = EXCLUDED.content,
+                        embedding = EXCLUDED.embedding,
+                        indexed_at = NOW()
+                    """,
+                    rows,
+                )
+            conn.commit()
+            indexed += len(rows)
 
         except Exception as e:
+            conn.rollback()
             errors.append(f"{file_path}: {e}")
 
-    return {"success": True, "indexed": indexed, "project": project, "errors": errors[:5]}
+    return {"success": True, "indexed": indexed, "skipped": skipped, "project": project, "errors": errors[:5]}
 
 
 def index_docs(conn: psycopg.Connection, arguments: dict[str, Any]) -> dict[str, Any]:
@@ -269,41 +459,57 @@ def index_docs(conn: psycopg.Connection, arguments: dict[str, Any]) -> dict[str,
     path = Path(arguments["path"]).expanduser()
     project = arguments.get("project", path.name)
 
+    # Compare mtimes against the last index run before reading any file
+    indexed_times = {} if arguments.get("force") else get_indexed_times(conn, "doc_index", project)
+
     indexed = 0
+    skipped = 0
     errors = []
 
-    for file_path in path.rglob("*"):
-        if file_path.suffix not in DOC_EXTENSIONS or not file_path.is_file():
-            continue
+    pending = []
+    for file_path in discover_files(path, DOC_EXTENSIONS):
+        try:
+            if is_current(file_path, indexed_times):
+                skipped += 1
+            else:
+                pending.append(file_path)
+        except OSError as e:
+            errors.append(f"{file_path}: {e}")
 
+    for file_path, prepared in prepare_files(pending):
         try:
-            content = file_path.read_text(errors="ignore")
-            if len(content) < 10:
+            if isinstance(prepared, Exception):
+                raise prepared
+            chunks, embeddings = prepared
+            if not chunks:
                 continue
 
-            for i, chunk in enumerate(chunk_content(content)):
-                chunk_id = hashlib.md5(f"{file_path}:{i}".encode()).hexdigest()
-                embedding = get_embedding(chunk)
-
-                with conn.cursor() as cur:
-                    cur.execute(
-                        """
-                        INSERT INTO doc_index (id, path, content, embedding, project)
-                        VALUES (%s, %s, %s, %s, %s)
-                        ON CONFLICT (id) DO UPDATE SET
-                            content = EXCLUDED.content,
-                            embedding = EXCLUDED.embedding,
-                            indexed_at = NOW()
-                        """,
-                        (chunk_id, str(file_path), chunk, embedding, project),
-                    )
-                conn.commit()
-                indexed += 1
+            rows = [
+                (hashlib.md5(f"{file_path}:{i}".encode()).hexdigest(), str(file_path), chunk, embedding, project)
+                for i, (chunk, embedding) in enumerate(zip(chunks, embeddings, strict=True))
+            ]
+
+            # All of a file's chunks in one statement batch and one transaction
+            with conn.cursor() as cur:
+                cur.executemany(
+                    """
+                    INSERT INTO doc_index (id, path, content, embedding, project)
+                    VALUES (%s, %s, %s, %s, %s)
+                    ON CONFLICT (id) DO UPDATE SET
+                        content = EXCLUDED.content,
+                        embedding = EXCLUDED.embedding,
+                        indexed_at = NOW()
+                    """,
+                    rows,
+                )
+            conn.commit()
+            indexed += len(rows)
 
         except Exception as e:
+            conn.rollback()
             errors.append(f"{file_path}: {e}")
 
-    return {"success": True, "indexed": indexed, "project": project, "errors": errors[:5]}
+    return {"success": True, "indexed": indexed, "skipped": skipped, "project": project, "errors": errors[:5]}
 
 
 def search_index(conn: psycopg.Connection, arguments: dict[str, Any]) -> dict[str, Any]:
@@ -313,75 +519,41 @@ def search_index(conn: psycopg.Connection, arguments: dict[str, Any]) -> dict[st
     limit = arguments.get("limit", 10)
     project_filter = arguments.get("project")
 
+    tables = []
+    if search_type in ("code", "all"):
+        tables.append(("code", "code_index"))
+    if search_type in ("docs", "all"):
+        tables.append(("docs", "doc_index"))
+    if not tables:
+        return {"success": True, "results": []}
+
     embedding = get_embedding(query)
-    results = []
+    where = "WHERE project = %(project)s" if project_filter else ""
+
+    # Each table's nearest neighbours come from its own index scan; PostgreSQL
+    # merges them, keeps the top `limit` and truncates content for readability
+    subqueries = [
+        f"""
+        (SELECT '{kind}' AS type, path, LEFT(content, 500) AS content,
+                1 - (embedding <=> %(embedding)s::vector) AS similarity
+         FROM {table}
+         {where}
+         ORDER BY embedding <=> %(embedding)s::vector
+         LIMIT %(limit)s)
+        """
+        for kind, table in tables
+    ]
+    sql = " UNION ALL ".join(subqueries) + " ORDER BY similarity DESC LIMIT %(limit)s"
 
     with conn.cursor() as cur:
-        if search_type in ("code", "all"):
-            if project_filter:
-                cur.execute(
-                    """
-                    SELECT path, content, 1 - (embedding <=> %s::vector) AS similarity
-                    FROM code_index
-                    WHERE project = %s
-                    ORDER BY embedding <=> %s::vector
-                    LIMIT %s
-                    """,
-                    (embedding, project_filter, embedding, limit),
-                )
-            else:
-                cur.execute(
-                    """
-                    SELECT path, content, 1 - (embedding <=> %s::vector) AS similarity
-                    FROM code_index
-                    ORDER BY embedding <=> %s::vector
-                    LIMIT %s
-                    """,
-                    (embedding, embedding, limit),
-                )
-
-            for row in cur.fetchall():
-                results.append({
-                    "type": "code",
-                    "path": row[0],
-                    "content": row[1][:500],  # Truncate for readability
-                    "similarity": float(row[2]),
-                })
-
-        if search_type in ("docs", "all"):
-            if project_filter:
-                cur.execute(
-                    """
-                    SELECT path, content, 1 - (embedding <=> %s::vector) AS similarity
-                    FROM doc_index
-                    WHERE project = %s
-                    ORDER BY embedding <=> %s::vector
-                    LIMIT %s
-                    """,
-                    (embedding, project_filter, embedding, limit),
-                )
-            else:
-                cur.execute(
-                    """
-                    SELECT path, content, 1 - (embedding <=> %s::vector) AS similarity
-                    FROM doc_index
-                    ORDER BY embedding <=> %s::vector
-                    LIMIT %s
-                    """,
-                    (embedding, embedding, limit),
-                )
-
-            for row in cur.fetchall():
-                results.append({
-                    "type": "docs",
-                    "path": row[0],
-                    "content": row[1][:500],
-                    "similarity": float(row[2]),
-                })
-
-    # Sort combined results by similarity
-    results.sort(key=lambda x: x["similarity"], reverse=True)
-    return {"success": True, "results": results[:limit]}
+        # The SQL text only varies with type and project filter, so prepare it server-side
+        cur.execute(sql, {"embedding": embedding, "project": project_filter, "limit": limit}, prepare=True)
+        results = [
+            {"type": row[0], "path": row[1], "content": row[2], "similarity": float(row[3])}
+            for row in cur.fetchall()
+        ]
+
+    return {"success": True, "results": results}
 
 
 def get_status(conn: psycopg.Connection, arguments: dict[str, Any]) -> dict[str, Any]:
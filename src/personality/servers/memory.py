@@ -8,18 +8,19 @@ Memories are scoped by cart (persona) for isolation between personas.
 import json
 import logging
 import os
+import threading
 from typing import Any
-from urllib.request import Request, urlopen
-from urllib.error import URLError
 from uuid import uuid4
 
+import httpx
 import psycopg
 from mcp.server import Server
 from mcp.server.lowlevel.helper_types import ReadResourceContents
 from mcp.server.stdio import stdio_server
 from mcp.types import Resource, ResourceTemplate, TextContent, Tool
-from pydantic import AnyUrl
+from pgvector import Vector
 from pgvector.psycopg import register_vector
+from pydantic import AnyUrl
 
 from personality.config import get_config
 
@@ -32,6 +33,26 @@ server = Server("memory")
 DEFAULT_CART_TAG = os.environ.get("PERSONALITY_CART", "default")
 
 
+# Shared Ollama client, so embedding requests reuse one keep-alive connection
+_ollama_client: httpx.Client | None = None
+_ollama_client_lock = threading.Lock()
+
+# Set once ensure_schema() has run in this process
+_schema_ready = False
+
+
+def get_ollama_client() -> httpx.Client:
+    """Get the shared httpx client for Ollama, creating it on first use."""
+    global _ollama_client
+    if _ollama_client is None:
+        # get_embedding is plain sync code that callers may run off the event loop in threads;
+        # if two first calls overlap, only one may build the client
+        with _ollama_client_lock:
+            if _ollama_client is None:
+                _ollama_client = httpx.Client(base_url=get_config().ollama.url, timeout=30.0)
+    return _ollama_client
+
+
 def get_connection() -> psycopg.Connection:
     """Get a PostgreSQL connection."""
     cfg = get_config().postgres
@@ -48,15 +69,14 @@ def get_connection() -> psycopg.Connection:
 def get_embedding(text: str) -> list[float]:
     """Get embedding for text using Ollama API."""
     cfg = get_config().ollama
-    url = f"{cfg.url}/api/embeddings"
-    data = json.dumps({"model": cfg.embedding_model, "prompt": text}).encode()
 
     try:
-        req = Request(url, data=data, headers={"Content-Type": "application/json"})
-        with urlopen(req, timeout=30) as resp:
-            result = json.loads(resp.read().decode())
-            return result["embedding"]
-    except URLError as e:
+        # /api/embed, like the indexer, so every stored and query vector comes from one endpoint
+        response = get_ollama_client().post("/api/embed", json={"model": cfg.embedding_model, "input": [text]})
+        response.raise_for_status()
+        result = response.json()
+        return result["embeddings"][0]
+    except httpx.HTTPError as e:
         logger.error(f"Ollama embedding failed: {e}")
         raise
     except KeyError:
@@ -65,7 +85,14 @@ def get_embedding(text: str) -> list[float]:
 
 
 def ensure_schema(conn: psycopg.Connection) -> None:
-    """Ensure the database schema exists."""
+    """Ensure the database schema exists.
+
+    The DDL runs once per process; later calls return immediately.
+    """
+    global _schema_ready
+    if _schema_ready:
+        return
+
     with conn.cursor() as cur:
         cur.execute("CREATE EXTENSION IF NOT EXISTS vector")
 
@@ -122,6 +149,7 @@ def ensure_schema(conn: psycopg.Connection) -> None:
             "CREATE INDEX IF NOT EXISTS memories_cart_id_idx ON memories (cart_id)"
         )
     conn.commit()
+    _schema_ready = True
 
 
 def get_or_create_cart(conn: psycopg.Connection, tag: str) -> str:
@@ -253,7 +281,8 @@ def store_memory(
     content = arguments["content"]
     metadata = arguments.get("metadata", {})
 
-    embedding = get_embedding(content)
+    # Packed float32, sent in binary rather than as a float8 array
+    embedding = Vector(get_embedding(content))
 
     with conn.cursor() as cur:
         cur.execute(
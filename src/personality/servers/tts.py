@@ -3,7 +3,6 @@
 
 Provides text-to-speech capabilities using piper-tts Python library.
 """
-import io
 import json
 import logging
 import subprocess
@@ -25,15 +24,17 @@ server = Server("tts")
 DEFAULT_VOICE = "en_US-lessac-medium"
 PIPER_DATA_DIR = Path.home() / ".local" / "share" / "psn"
 
-# Lazy-loaded piper components
-_piper_voice = None
+# Lazy-loaded piper voices by name; loading a model is far slower than
+# synthesizing a sentence, so each voice is loaded once per process
+_piper_voices: dict[str, Any] = {}
 
 
 def get_piper_voice(voice_name: str | None = None):
     """Get or create piper voice instance."""
-    global _piper_voice
-
     voice = voice_name or DEFAULT_VOICE
+    if voice in _piper_voices:
+        return _piper_voices[voice], None
+
     voices_dir = PIPER_DATA_DIR / "voices"
     model_path = voices_dir / f"{voice}.onnx"
     config_path = voices_dir / f"{voice}.onnx.json"
@@ -44,8 +45,9 @@ def get_piper_voice(voice_name: str | None = None):
     try:
         from piper import PiperVoice
 
-        _piper_voice = PiperVoice.load(str(model_path), str(config_path))
-        return _piper_voice, None
+        piper_voice = PiperVoice.load(str(model_path), str(config_path))
+        _piper_voices[voice] = piper_voice
+        return piper_voice, None
     except ImportError:
         return None, "piper-tts not installed. Run: pip install piper-tts"
     except Exception as e:
@@ -73,27 +75,24 @@ def speak_text(text: str, voice: str | None = None) -> dict[str, Any]:
         return {"success": False, "error": error}
 
     try:
-        # Generate audio to WAV bytes
-        audio_buffer = io.BytesIO()
-
-        with wave.open(audio_buffer, "wb") as wav_file:
-            wav_file.setnchannels(1)
-            wav_file.setsampwidth(2)  # 16-bit
-            wav_file.setframerate(piper_voice.config.sample_rate)
-
-            for chunk in piper_voice.synthesize(text):
-                wav_file.writeframes(chunk.audio_int16_bytes)
-
-        # Write to temp file and play (macOS)
         with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp_file:
-            tmp_file.write(audio_buffer.getvalue())
-            tmp_path = tmp_file.name
-
-        # Play audio using afplay (macOS)
-        subprocess.run(["afplay", tmp_path], timeout=120, check=True)
-
-        # Clean up
-        Path(tmp_path).unlink(missing_ok=True)
+            tmp_path = Path(tmp_file.name)
+
+        # Remove the temp file whether synthesis and playback succeed or not
+        try:
+            # Stream audio chunks straight into the WAV file as they're synthesized
+            with wave.open(str(tmp_path), "wb") as wav_file:
+                wav_file.setnchannels(1)
+                wav_file.setsampwidth(2)  # 16-bit
+                wav_file.setframerate(piper_voice.config.sample_rate)
+
+                for chunk in piper_voice.synthesize(text):
+                    wav_file.writeframes(chunk.audio_int16_bytes)
+
+            # Play audio using afplay (macOS)
+            subprocess.run(["afplay", str(tmp_path)], timeout=120, check=True)
+        finally:
+            tmp_path.unlink(missing_ok=True)
 
         return {"success": True, "text": text[:100] + "..." if len(text) > 100 else text}
 
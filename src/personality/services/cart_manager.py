@@ -5,9 +5,13 @@ Manages saving and loading persona data as cartridge (`.pcart`) files.
 A .pcart file is a ZIP archive containing persona.yml and preferences.yml.
 """
 
+import io
+import os
 import zipfile
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
+from typing import Any
 
 import yaml
 
@@ -26,6 +30,26 @@ CART_EXTENSION = ".pcart"
 # Cart schema version
 CART_SCHEMA_VERSION = 1
 
+# C dumper when PyYAML has libyaml; typed loosely so either class fits without an ignore
+_YamlDumper: type[Any]
+try:
+    _YamlDumper = yaml.CSafeDumper
+except AttributeError:  # PyYAML built without libyaml
+    _YamlDumper = yaml.SafeDumper
+
+
+def dump_yaml(data: dict[str, Any]) -> str:
+    """
+    Serialize a dict to block-style YAML, preserving key order.
+
+    Args:
+        data: The data to serialize.
+
+    Returns:
+        YAML text.
+    """
+    return str(yaml.dump(data, Dumper=_YamlDumper, default_flow_style=False, allow_unicode=True, sort_keys=False))
+
 
 class CartManager:
     """
@@ -65,9 +89,26 @@ class CartManager:
             FileNotFoundError: If file doesn't exist.
             ValueError: If file is invalid.
         """
-        if not path.exists():
-            raise FileNotFoundError(f"Cart file not found: {path}")
+        try:
+            stat = path.stat()
+        except OSError:
+            raise FileNotFoundError(f"Cart file not found: {path}") from None
+
+        # Re-read only when the file changed; copy so callers can't alter the cached cart
+        cart = _load_cached(path, stat.st_mtime_ns, stat.st_size)
+        return cart.model_copy(deep=True)
+
+    @staticmethod
+    def _load_path(path: Path) -> Cartridge:
+        """
+        Read and parse a .pcart file, bypassing the cache.
+
+        Args:
+            path: Path to the .pcart file.
 
+        Returns:
+            Loaded Cartridge.
+        """
         try:
             with zipfile.ZipFile(path, "r") as zf:
                 # Read persona.yml (required)
@@ -156,18 +197,21 @@ class CartManager:
             "version": cart.persona.version,
             "memories": [{"subject": m.subject, "content": m.content} for m in cart.persona.memories],
         }
-        persona_yaml = yaml.dump(persona_dict, default_flow_style=False, allow_unicode=True, sort_keys=False)
+        persona_yaml = dump_yaml(persona_dict)
 
         # Serialize preferences.yml
         prefs_dict = cart.preferences.to_dict()
-        prefs_yaml = yaml.dump(prefs_dict, default_flow_style=False, allow_unicode=True, sort_keys=False)
+        prefs_yaml = dump_yaml(prefs_dict) if prefs_dict else "{}\n"
 
-        # Write ZIP archive
-        path.parent.mkdir(parents=True, exist_ok=True)
-        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        # Build the ZIP archive in memory, then write it out in one go
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
             zf.writestr("persona.yml", persona_yaml)
             zf.writestr("preferences.yml", prefs_yaml)
 
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(buffer.getvalue())
+
         return path
 
     def create_from_training(self, training_path: Path, output_path: Path | None = None) -> Cartridge:
@@ -231,7 +275,12 @@ class CartManager:
         if not self._carts_dir.exists():
             return []
 
-        return sorted(self._carts_dir.glob(f"*{CART_EXTENSION}"))
+        # scandir yields entry type info from the directory read itself,
+        # so filtering needs no per-path stat calls.
+        with os.scandir(self._carts_dir) as entries:
+            carts = [Path(e.path) for e in entries if e.name.endswith(CART_EXTENSION) and e.is_file()]
+        carts.sort()
+        return carts
 
     def get_cart_info(self, path: Path) -> dict:
         """
@@ -279,3 +328,14 @@ class CartManager:
             return False, str(e)
         except Exception as e:
             return False, f"Unexpected error: {e}"
+
+
+@lru_cache(maxsize=32)
+def _load_cached(path: Path, mtime_ns: int, size: int) -> Cartridge:
+    """
+    Load a cartridge, cached by path and stat signature.
+
+    mtime_ns and size are only part of the cache key: a modified cart
+    misses the cache and is read again.
+    """
+    return CartManager._load_path(path)
@@ -10,7 +10,7 @@ from typing import Any
 import yaml
 
 from personality.schemas.pcart import Cartridge
-from personality.services.cart_manager import CART_EXTENSION, CartManager
+from personality.services.cart_manager import CART_EXTENSION, CartManager, dump_yaml
 
 # State file name
 STATE_FILE = "current_cart.yml"
@@ -177,5 +177,14 @@ class CartRegistry:
     def _save_state(self, state: dict[str, Any]) -> None:
         """Save state to file."""
         self._state_dir.mkdir(parents=True, exist_ok=True)
-        content = yaml.dump(state, default_flow_style=False)
+
+        # Fast paths for the two states written on every switch/clear
+        active = state.get("active")
+        if not state:
+            content = ""
+        elif len(state) == 1 and isinstance(active, str) and active.isprintable():
+            quoted = active.replace("'", "''")
+            content = f"active: '{quoted}'\n"
+        else:
+            content = dump_yaml(state)
         self.state_file.write_text(content, encoding="utf-8")
@@ -5,7 +5,7 @@ Provides file-based storage for decisions with ADR (Architecture Decision Record
 """
 
 import json
-import uuid
+import secrets
 from datetime import datetime
 from pathlib import Path
 
@@ -41,18 +41,31 @@ class DecisionService:
         self._persona = persona
         self._project = project
         self._store: DecisionStore | None = None
+        self._store_mtime: int | None = None
+
+        # Warm the store up front so the first command doesn't pay for the read
+        self._load_store()
 
     @property
     def store_path(self) -> Path:
         """Get the path to the decision store file."""
         return self._data_dir / DECISIONS_FILE
 
+    def _store_file_mtime(self) -> int | None:
+        """Get the store file's modification time, or None if it doesn't exist."""
+        try:
+            return self.store_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
     def _load_store(self) -> DecisionStore:
-        """Load the decision store from disk."""
-        if self._store is not None:
+        """Load the decision store from disk, reloading only if the file changed."""
+        mtime = self._store_file_mtime()
+        if self._store is not None and mtime == self._store_mtime:
             return self._store
 
-        if self.store_path.exists():
+        self._store_mtime = mtime
+        if mtime is not None:
             try:
                 data = json.loads(self.store_path.read_text(encoding="utf-8"))
                 self._store = DecisionStore.from_dict(data)
@@ -71,6 +84,7 @@ class DecisionService:
         self._data_dir.mkdir(parents=True, exist_ok=True)
         data = self._store.to_dict()
         self.store_path.write_text(json.dumps(data, indent=2, default=str), encoding="utf-8")
+        self._store_mtime = self._store_file_mtime()
 
     def record(
         self,
@@ -107,7 +121,7 @@ class DecisionService:
         store = self._load_store()
 
         dec = Decision(
-            id=str(uuid.uuid4())[:8],
+            id=secrets.token_hex(4),
             title=title,
             context=context,
             decision=decision,
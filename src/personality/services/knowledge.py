@@ -3,18 +3,95 @@ Knowledge service for managing subject-predicate-object triples.
 
 Provides file-based storage for structured knowledge with
 CRUD operations and basic search capabilities.
+
+Storage is a JSON snapshot plus an append-only JSONL journal of the
+adds and removes made since. The snapshot is rewritten (and the journal
+truncated) once the journal outgrows it.
 """
 
+import heapq
 import json
+import mmap
+import os
 import uuid
+from collections.abc import Iterable
 from datetime import datetime
 from pathlib import Path
+from typing import Any
 
 from personality.schemas.knowledge import KnowledgeStore, KnowledgeTriple
 
 # Default storage location
 DATA_DIR = Path(__file__).parent.parent.parent.parent / "data"
 KNOWLEDGE_FILE = "knowledge.json"
+JOURNAL_FILE = "knowledge.log"
+
+# Stores at least this large are memory-mapped instead of read into a buffer
+MMAP_THRESHOLD = 64 * 1024
+
+try:
+    import orjson
+except ImportError:  # optional speedup, fall back to the stdlib
+    orjson = None  # type: ignore[assignment]
+
+
+def _json_dumps(data: dict[str, Any]) -> bytes:
+    """Serialize a dict to indented JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, default=str).encode("utf-8")
+
+
+def _json_loads(raw: bytes) -> Any:
+    """Parse JSON from UTF-8 bytes."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _json_compact(data: Any) -> bytes:
+    """Serialize a value to compact JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, default=str).encode("utf-8")
+
+
+def _json_line(data: dict[str, Any]) -> bytes:
+    """Serialize a dict to a compact, newline-terminated JSON line."""
+    return _json_compact(data) + b"\n"
+
+
+def _read_json(path: Path) -> Any:
+    """Parse a JSON file, memory-mapping large files when orjson is available."""
+    if orjson is None or path.stat().st_size < MMAP_THRESHOLD:
+        return _json_loads(path.read_bytes())
+
+    with path.open("rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+        return orjson.loads(view)
+
+
+def _consume_triples(raw_triples: list[dict[str, Any]]) -> list[KnowledgeTriple]:
+    """
+    Build triples from parsed dicts, emptying the input list as it goes.
+
+    Each raw dict is released as soon as its triple exists, so a large
+    store never holds both complete representations at once.
+    """
+    raw_triples.reverse()
+    triples: list[KnowledgeTriple] = []
+    while raw_triples:
+        triples.append(KnowledgeTriple(**raw_triples.pop()))
+    return triples
+
+
+def _utf8(text: str) -> bytes:
+    """Encode a text as UTF-8, passing through lone surrogates."""
+    return text.encode("utf-8", "surrogatepass")
+
+
+def _trigrams(text: str) -> set[str]:
+    """Get the set of 3-character substrings of a text."""
+    return {text[i : i + 3] for i in range(len(text) - 2)}
 
 
 class KnowledgeService:
@@ -44,11 +121,29 @@ class KnowledgeService:
         self._project = project
         self._store: KnowledgeStore | None = None
 
+        # In-memory indexes, rebuilt on load and kept in sync on writes:
+        # triples by id, lowercased UTF-8 (subject, predicate, object) per
+        # id (bytes, so substring checks never convert between str kinds),
+        # trigram -> ids of triples containing it in any field, and
+        # persona -> ids of its triples.
+        self._by_id: dict[str, KnowledgeTriple] = {}
+        self._lower: dict[str, tuple[bytes, bytes, bytes]] = {}
+        self._trigram_index: dict[str, set[str]] = {}
+        self._by_persona: dict[str, set[str]] = {}
+
+        # Serialized snapshot entry per triple id, filled on first save
+        self._chunks: dict[str, bytes] = {}
+
     @property
     def store_path(self) -> Path:
         """Get the path to the knowledge store file."""
         return self._data_dir / KNOWLEDGE_FILE
 
+    @property
+    def journal_path(self) -> Path:
+        """Get the path to the knowledge journal file."""
+        return self._data_dir / JOURNAL_FILE
+
     def _load_store(self) -> KnowledgeStore:
         """Load the knowledge store from disk."""
         if self._store is not None:
@@ -56,23 +151,165 @@ class KnowledgeService:
 
         if self.store_path.exists():
             try:
-                data = json.loads(self.store_path.read_text(encoding="utf-8"))
+                data = _read_json(self.store_path)
+                raw_triples = data.pop("triples", [])
                 self._store = KnowledgeStore.from_dict(data)
+                self._store.triples = _consume_triples(raw_triples)
             except Exception:
                 self._store = KnowledgeStore(persona=self._persona, project=self._project)
         else:
             self._store = KnowledgeStore(persona=self._persona, project=self._project)
 
+        self._replay_journal(self._store)
+        self._rebuild_index()
         return self._store
 
+    def _replay_journal(self, store: KnowledgeStore) -> None:
+        """Apply journal entries written since the last snapshot."""
+        if not self.journal_path.exists():
+            return
+
+        # A crash between snapshot write and journal truncation leaves
+        # entries that are already in the snapshot, so adds are idempotent.
+        known = {t.id for t in store.triples}
+        for line in self.journal_path.read_bytes().splitlines():
+            try:
+                entry = _json_loads(line)
+                if entry["op"] == "add":
+                    triple = KnowledgeTriple(**entry["triple"])
+                    if triple.id not in known:
+                        store.triples.append(triple)
+                        known.add(triple.id)
+                elif entry["op"] == "remove":
+                    store.remove(entry["id"])
+                    known.discard(entry["id"])
+                store.updated_at = datetime.fromisoformat(entry["updated_at"])
+            except Exception:
+                continue  # Skip a torn or malformed entry
+
+    def _append_journal(self, entries: list[dict[str, Any]]) -> None:
+        """Append entries to the journal, compacting it if it outgrew the snapshot."""
+        self._data_dir.mkdir(parents=True, exist_ok=True)
+        with self.journal_path.open("ab") as fh:
+            fh.write(b"".join(_json_line(entry) for entry in entries))
+            journal_size = fh.tell()
+
+        try:
+            snapshot_size = self.store_path.stat().st_size
+        except FileNotFoundError:
+            snapshot_size = 0
+
+        if journal_size > snapshot_size:
+            self._save_store()
+
+    def _rebuild_index(self) -> None:
+        """Rebuild the indexes from the loaded store."""
+        self._chunks = {}
+        self._by_id = {}
+        self._lower = {}
+        self._trigram_index = {}
+        self._by_persona = {}
+        if self._store is not None:
+            for triple in self._store.triples:
+                self._index_triple(triple)
+
+    def _index_triple(self, triple: KnowledgeTriple) -> None:
+        """Add a triple to the indexes."""
+        self._by_id[triple.id] = triple
+        fields = (triple.subject.lower(), triple.predicate.lower(), triple.object.lower())
+        self._lower[triple.id] = (_utf8(fields[0]), _utf8(fields[1]), _utf8(fields[2]))
+        self._by_persona.setdefault(triple.persona, set()).add(triple.id)
+        for gram in _trigrams(fields[0]) | _trigrams(fields[1]) | _trigrams(fields[2]):
+            self._trigram_index.setdefault(gram, set()).add(triple.id)
+
+    def _unindex_triple(self, triple_id: str) -> None:
+        """Remove a triple from the indexes."""
+        triple = self._by_id.pop(triple_id, None)
+        self._chunks.pop(triple_id, None)
+        self._lower.pop(triple_id, None)
+        if triple is None:
+            return
+        ids = self._by_persona.get(triple.persona)
+        if ids is not None:
+            ids.discard(triple_id)
+            if not ids:
+                del self._by_persona[triple.persona]
+        fields = (triple.subject.lower(), triple.predicate.lower(), triple.object.lower())
+        for gram in _trigrams(fields[0]) | _trigrams(fields[1]) | _trigrams(fields[2]):
+            ids = self._trigram_index.get(gram)
+            if ids is not None:
+                ids.discard(triple_id)
+                if not ids:
+                    del self._trigram_index[gram]
+
+    def _candidates(self, needle: str) -> set[str] | None:
+        """
+        Get ids of triples that may contain a lowercased substring.
+
+        Returns:
+            Candidate ids (a superset of the matches), or None if the
+            needle is too short to narrow down with the index.
+        """
+        grams = _trigrams(needle)
+        if not grams:
+            return None
+
+        # Intersect smallest sets first; bail out as soon as it's empty
+        sets = sorted((self._trigram_index.get(g, set()) for g in grams), key=len)
+        result = set(sets[0])
+        for ids in sets[1:]:
+            if not result:
+                break
+            result &= ids
+        return result
+
     def _save_store(self) -> None:
         """Save the knowledge store to disk."""
         if self._store is None:
             return
 
         self._data_dir.mkdir(parents=True, exist_ok=True)
-        data = self._store.to_dict()
-        self.store_path.write_text(json.dumps(data, indent=2, default=str), encoding="utf-8")
+
+        # Write to a temp file and rename so a crash never leaves a truncated store
+        tmp_path = self.store_path.with_suffix(".json.tmp")
+        tmp_path.write_bytes(self._serialize_store(self._store))
+        os.replace(tmp_path, self.store_path)
+
+        # Everything in the journal is now part of the snapshot
+        self.journal_path.unlink(missing_ok=True)
+
+    def _triple_chunk(self, triple: KnowledgeTriple) -> bytes:
+        """Get a triple's serialized snapshot entry, indented for the triples list."""
+        chunk = self._chunks.get(triple.id)
+        if chunk is None:
+            chunk = b"\n    " + _json_dumps(triple.model_dump(mode="json")).replace(b"\n", b"\n    ")
+            self._chunks[triple.id] = chunk
+        return chunk
+
+    def _serialize_store(self, store: KnowledgeStore) -> bytes:
+        """
+        Serialize the store as indented JSON, same layout as KnowledgeStore.to_dict.
+
+        Triple entries are cached, so a save only serializes triples added
+        since the previous one.
+        """
+        chunks = [self._triple_chunk(t) for t in store.triples]
+        triples = b"[" + b",".join(chunks) + b"\n  ]" if chunks else b"[]"
+        return b"".join(
+            [
+                b'{\n  "version": ',
+                _json_compact(store.version),
+                b',\n  "persona": ',
+                _json_compact(store.persona),
+                b',\n  "project": ',
+                _json_compact(store.project),
+                b',\n  "triples": ',
+                triples,
+                b',\n  "updated_at": ',
+                _json_compact(store.updated_at.isoformat()),
+                b"\n}",
+            ]
+        )
 
     def add(
         self,
@@ -100,24 +337,66 @@ class KnowledgeService:
         Returns:
             The created KnowledgeTriple.
         """
-        store = self._load_store()
-
-        triple = KnowledgeTriple(
-            id=str(uuid.uuid4())[:8],
-            subject=subject,
-            predicate=predicate,
-            object=obj,
-            persona=persona or self._persona,
-            project=project or self._project,
+        return self.add_many(
+            [(subject, predicate, obj)],
+            persona=persona,
+            project=project,
             confidence=confidence,
             source=source,
-            created_at=datetime.now(),
-        )
+        )[0]
 
-        store.add(triple)
-        self._save_store()
+    def add_many(
+        self,
+        triples: Iterable[tuple[str, str, str]],
+        *,
+        persona: str | None = None,
+        project: str | None = None,
+        confidence: float = 1.0,
+        source: str = "",
+    ) -> list[KnowledgeTriple]:
+        """
+        Add several knowledge triples with a single journal write.
+
+        Args:
+            triples: (subject, predicate, object) tuples.
+            persona: Associated persona (defaults to service persona).
+            project: Project context (defaults to service project).
+            confidence: Confidence score (0.0-1.0).
+            source: Source of the knowledge.
 
-        return triple
+        Returns:
+            The created KnowledgeTriples.
+        """
+        store = self._load_store()
+        now = datetime.now()
+
+        created = [
+            KnowledgeTriple(
+                id=uuid.uuid4().hex[:8],
+                subject=subject,
+                predicate=predicate,
+                object=obj,
+                persona=persona or self._persona,
+                project=project or self._project,
+                confidence=confidence,
+                source=source,
+                created_at=now,
+            )
+            for subject, predicate, obj in triples
+        ]
+        if not created:
+            return created
+
+        for triple in created:
+            store.add(triple)
+            self._index_triple(triple)
+
+        updated_at = store.updated_at.isoformat()
+        self._append_journal(
+            [{"op": "add", "triple": t.model_dump(mode="json"), "updated_at": updated_at} for t in created]
+        )
+
+        return created
 
     def query(
         self,
@@ -139,12 +418,26 @@ class KnowledgeService:
             List of matching triples.
         """
         store = self._load_store()
-        results = store.find(subject, predicate, obj)
 
+        # (field position, lowercased needle) for each filter given
+        active = [(i, f.lower()) for i, f in enumerate((subject, predicate, obj)) if f]
+        active_utf8 = [(i, _utf8(needle)) for i, needle in active]
+
+        # Narrow down with the persona and trigram indexes where the filters allow it
+        candidates: set[str] | None = None
         if persona:
-            results = [t for t in results if t.persona == persona]
+            candidates = self._by_persona.get(persona, set())
+        for _, needle in active:
+            ids = self._candidates(needle)
+            if ids is not None:
+                candidates = ids if candidates is None else candidates & ids
+
+        triples = store.triples if candidates is None else [t for t in store.triples if t.id in candidates]
+        if not active:
+            return list(triples)
 
-        return results
+        lower = self._lower
+        return [t for t in triples if all(needle in lower[t.id][i] for i, needle in active_utf8)]
 
     def search(self, query: str, limit: int = 10) -> list[KnowledgeTriple]:
         """
@@ -161,16 +454,21 @@ class KnowledgeService:
         """
         store = self._load_store()
         query_lower = query.lower()
+        needle = _utf8(query_lower)
+
+        candidates = self._candidates(query_lower)
+        triples = store.triples if candidates is None else [t for t in store.triples if t.id in candidates]
 
         # Score each triple by how many fields match
         scored: list[tuple[int, KnowledgeTriple]] = []
-        for triple in store.triples:
+        for triple in triples:
+            subject, predicate, obj = self._lower[triple.id]
             score = 0
-            if query_lower in triple.subject.lower():
+            if needle in subject:
                 score += 3  # Subject match is most important
-            if query_lower in triple.object.lower():
+            if needle in obj:
                 score += 2  # Object match is second
-            if query_lower in triple.predicate.lower():
+            if needle in predicate:
                 score += 1  # Predicate match is least important
 
             if score > 0:
@@ -192,9 +490,8 @@ class KnowledgeService:
             List of triples, most recent first.
         """
         store = self._load_store()
-        # Sort by created_at descending
-        sorted_triples = sorted(store.triples, key=lambda t: t.created_at, reverse=True)
-        return sorted_triples[:limit]
+        # Most recent first; equivalent to a stable descending sort, O(N log limit)
+        return heapq.nlargest(limit, store.triples, key=lambda t: t.created_at)
 
     def get(self, triple_id: str) -> KnowledgeTriple | None:
         """
@@ -206,11 +503,8 @@ class KnowledgeService:
         Returns:
             The triple or None if not found.
         """
-        store = self._load_store()
-        for triple in store.triples:
-            if triple.id == triple_id:
-                return triple
-        return None
+        self._load_store()
+        return self._by_id.get(triple_id)
 
     def remove(self, triple_id: str) -> bool:
         """
@@ -223,8 +517,14 @@ class KnowledgeService:
             True if removed, False if not found.
         """
         store = self._load_store()
-        if store.remove(triple_id):
-            self._save_store()
+        triple = self._by_id.get(triple_id)
+        if triple is not None:
+            # Match by identity; list.remove() would call the model __eq__ on every earlier triple
+            index = next(i for i, t in enumerate(store.triples) if t is triple)
+            del store.triples[index]
+            store.updated_at = datetime.now()
+            self._unindex_triple(triple_id)
+            self._append_journal([{"op": "remove", "id": triple_id, "updated_at": store.updated_at.isoformat()}])
             return True
         return False
 
@@ -239,6 +539,7 @@ class KnowledgeService:
         count = len(store.triples)
         store.triples = []
         store.updated_at = datetime.now()
+        self._rebuild_index()
         self._save_store()
         return count
 
@@ -4,11 +4,27 @@ Memory consolidator service.
 Merges related memories to reduce count while preserving key information.
 """
 
+import math
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
 
+# Common words ignored when comparing memory content
+_STOP_WORDS = frozenset(
+    {"the", "a", "an", "is", "are", "was", "were", "be", "been", "to", "of", "and", "or", "in", "on"}
+)
 
-@dataclass
+# Word tokens; punctuation never sticks to a word
+_WORD_RE = re.compile(r"\w+")
+
+# Groups at least this large are merged in worker processes (when there is
+# more than one); for smaller groups process startup costs more than it saves
+PARALLEL_MIN_GROUP_SIZE = 200
+
+
+@dataclass(slots=True)
 class ConsolidationResult:
     """Result of a consolidation operation."""
 
@@ -31,7 +47,7 @@ class ConsolidationResult:
         return (self.reduction / self.original_count) * 100
 
 
-@dataclass
+@dataclass(slots=True)
 class MemoryGroup:
     """A group of related memories."""
 
@@ -91,15 +107,18 @@ class MemoryConsolidator:
         # Group memories by subject prefix
         groups = self._group_by_subject(memories)
 
+        # Groups are independent, so merge the large ones in parallel
+        premerged = self._merge_large_groups(groups)
+
         # Consolidate within each group
         consolidated: list[dict] = []
-        for group in groups.values():
+        for prefix, group in groups.items():
             if group.count < self._min_group_size:
                 # Keep ungrouped memories as-is
                 consolidated.extend(group.memories)
             else:
                 # Find similar memories within group
-                merged, count = self._merge_similar(group.memories)
+                merged, count = premerged.get(prefix) or self._merge_similar(group.memories)
                 consolidated.extend(merged)
                 if count > 0:
                     result.groups_merged += 1
@@ -120,22 +139,20 @@ class MemoryConsolidator:
         """
         pairs: list[tuple[dict, dict, float]] = []
 
-        for i, mem1 in enumerate(memories):
-            for mem2 in memories[i + 1 :]:
-                # Only compare memories with same subject prefix
-                subj1 = mem1.get("subject", "").split(".")[0]
-                subj2 = mem2.get("subject", "").split(".")[0]
+        # Tokenize each memory once, then only compare pairs that can be similar
+        token_sets = [self._tokenize(m.get("content", "")) for m in memories]
+        prefixes = [m.get("subject", "").split(".")[0] for m in memories]
 
-                if subj1 != subj2:
+        for i, candidates in enumerate(self._candidate_pairs(token_sets)):
+            for j in candidates:
+                # Only compare memories with same subject prefix
+                if prefixes[i] != prefixes[j]:
                     continue
 
-                similarity = self._calculate_similarity(
-                    mem1.get("content", ""),
-                    mem2.get("content", ""),
-                )
+                similarity = self._jaccard(token_sets[i], token_sets[j])
 
                 if similarity >= self._similarity_threshold:
-                    pairs.append((mem1, mem2, similarity))
+                    pairs.append((memories[i], memories[j], similarity))
 
         # Sort by similarity descending
         pairs.sort(key=lambda x: x[2], reverse=True)
@@ -186,6 +203,23 @@ class MemoryConsolidator:
 
         return groups
 
+    def _merge_large_groups(self, groups: dict[str, MemoryGroup]) -> dict[str, tuple[list[dict], int]]:
+        """
+        Merge large groups across worker processes.
+
+        Returns:
+            _merge_similar results by group prefix; empty when there are
+            fewer than two large groups to spread out.
+        """
+        large = {prefix: g.memories for prefix, g in groups.items() if g.count >= PARALLEL_MIN_GROUP_SIZE}
+        if len(large) < 2:
+            return {}
+
+        workers = min(len(large), max(1, (os.cpu_count() or 2) // 2))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(self._merge_similar, large.values())
+            return dict(zip(large, results, strict=True))
+
     def _merge_similar(self, memories: list[dict]) -> tuple[list[dict], int]:
         """
         Merge similar memories within a group.
@@ -201,6 +235,9 @@ class MemoryConsolidator:
         result: list[dict] = []
         merge_count = 0
 
+        token_sets = [self._tokenize(m.get("content", "")) for m in memories]
+        candidate_pairs = self._candidate_pairs(token_sets)
+
         for i, mem1 in enumerate(memories):
             if i in merged_indices:
                 continue
@@ -209,14 +246,11 @@ class MemoryConsolidator:
             best_match_idx = -1
             best_similarity = 0.0
 
-            for j, mem2 in enumerate(memories[i + 1 :], start=i + 1):
+            for j in candidate_pairs[i]:
                 if j in merged_indices:
                     continue
 
-                similarity = self._calculate_similarity(
-                    mem1.get("content", ""),
-                    mem2.get("content", ""),
-                )
+                similarity = self._jaccard(token_sets[i], token_sets[j])
 
                 if similarity > best_similarity and similarity >= self._similarity_threshold:
                     best_similarity = similarity
@@ -246,41 +280,75 @@ class MemoryConsolidator:
         if not text1 or not text2:
             return 0.0
 
-        # Normalize and tokenize
-        words1 = set(text1.lower().split())
-        words2 = set(text2.lower().split())
+        return self._jaccard(self._tokenize(text1), self._tokenize(text2))
 
-        # Remove common stop words
-        stop_words = {"the", "a", "an", "is", "are", "was", "were", "be", "been", "to", "of", "and", "or", "in", "on"}
-        words1 -= stop_words
-        words2 -= stop_words
+    @staticmethod
+    def _tokenize(text: str) -> set[str]:
+        """Normalize and tokenize text into a set of words, minus stop words."""
+        return {w for w in _WORD_RE.findall(text.lower()) if w not in _STOP_WORDS}
 
+    @staticmethod
+    def _jaccard(words1: set[str], words2: set[str]) -> float:
+        """Jaccard similarity of two word sets."""
         if not words1 or not words2:
             return 0.0
 
-        # Jaccard similarity
         intersection = len(words1 & words2)
         union = len(words1 | words2)
 
         return intersection / union if union > 0 else 0.0
 
-    def _combine_content(self, content1: str, content2: str) -> str:
-        """Combine two content strings, removing duplicates."""
-        # Split into sentences/phrases
-        parts1 = [p.strip() for p in content1.split(".") if p.strip()]
-        parts2 = [p.strip() for p in content2.split(".") if p.strip()]
+    def _candidate_pairs(self, token_sets: list[set[str]]) -> list[list[int]]:
+        """
+        Find, for each memory, the later memories worth comparing with it.
+
+        Uses prefix filtering: with words ordered rarest first, two sets
+        with Jaccard similarity >= t must share a word among the first
+        |x| - ceil(t * |x|) + 1 words of each. Only pairs sharing such a
+        prefix word are returned, which is exact (no similar pair is
+        missed) and skips most dissimilar pairs.
 
-        # Combine unique parts
-        combined = []
-        seen = set()
+        Returns:
+            For each index i, the ascending indices j > i of its candidates.
+        """
+        count = len(token_sets)
+        threshold = self._similarity_threshold
+        if threshold <= 0:
+            return [list(range(i + 1, count)) for i in range(count)]
+
+        frequency: dict[str, int] = {}
+        for tokens in token_sets:
+            for token in tokens:
+                frequency[token] = frequency.get(token, 0) + 1
+
+        # Index each memory under the rarest words of its set
+        postings: dict[str, list[int]] = {}
+        for i, tokens in enumerate(token_sets):
+            # Small epsilon so float error can only lengthen the prefix
+            prefix_len = len(tokens) - math.ceil(threshold * len(tokens) - 1e-9) + 1
+            if prefix_len <= 0:
+                continue
+            for token in sorted(tokens, key=lambda t: (frequency[t], t))[:prefix_len]:
+                postings.setdefault(token, []).append(i)
 
-        for part in parts1 + parts2:
-            normalized = part.lower()
-            if normalized not in seen:
-                combined.append(part)
-                seen.add(normalized)
+        candidates: list[set[int]] = [set() for _ in range(count)]
+        for indices in postings.values():
+            for k, i in enumerate(indices):
+                candidates[i].update(indices[k + 1 :])
 
-        result = ". ".join(combined)
+        return [sorted(c) for c in candidates]
+
+    def _combine_content(self, content1: str, content2: str) -> str:
+        """Combine two content strings, removing duplicates."""
+        # Split both into sentences/phrases in one pass, keeping the first
+        # occurrence of each (case-insensitively) in order
+        unique: dict[str, str] = {}
+        for part in f"{content1}.{content2}".split("."):
+            part = part.strip()
+            if part:
+                unique.setdefault(part.lower(), part)
+
+        result = ". ".join(unique.values())
         if result and not result.endswith("."):
             result += "."
 
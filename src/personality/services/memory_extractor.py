@@ -5,11 +5,13 @@ Extracts learnings, preferences, and facts from conversation transcripts.
 """
 
 import re
-from dataclasses import dataclass
+from bisect import bisect_right
+from collections.abc import Iterator
+from dataclasses import dataclass, field, replace
 from datetime import datetime
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ExtractedMemory:
     """A memory extracted from a transcript."""
 
@@ -18,10 +20,14 @@ class ExtractedMemory:
     source: str = "transcript"
     confidence: float = 0.8
     created_at: datetime | None = None
+    content_lower: str = field(default="", repr=False, compare=False)
 
     def __post_init__(self) -> None:
+        # Frozen, so defaults are filled in through object.__setattr__
         if self.created_at is None:
-            self.created_at = datetime.now()
+            object.__setattr__(self, "created_at", datetime.now())
+        if not self.content_lower:
+            object.__setattr__(self, "content_lower", self.content.lower())
 
 
 # Patterns for extracting different types of information
@@ -52,9 +58,62 @@ EXTRACTION_PATTERNS = {
     ],
 }
 
+# Patterns compiled once at import. Kept separate rather than joined into one
+# alternation per subject: each pattern must find its own, possibly
+# overlapping, matches.
+_COMPILED_PATTERNS = {
+    subject: tuple(re.compile(p, re.IGNORECASE | re.MULTILINE) for p in patterns)
+    for subject, patterns in EXTRACTION_PATTERNS.items()
+}
+
+# Literal keywords at least one of which every extraction pattern requires.
+# Text without any of them can't match, so the patterns are skipped.
+# Keep in sync with EXTRACTION_PATTERNS.
+_TRIGGER_RE = re.compile(
+    "|".join(
+        [
+            # user.preference
+            r"prefer|like|want|always|usually|never",
+            r"please |don't |do not ",
+            # user.correction
+            r"actually|no,|wrong|incorrect|not quite|that's not right",
+            r"i mean",
+            # project.info
+            r"project",
+            r"we're using|we use|we have",
+            # knowledge.tech
+            r"\s(?:is|are)\s",
+            # user.identity
+            r"my name is|i'm called|call me",
+            r"i am|i'm",
+        ]
+    ),
+    re.IGNORECASE,
+)
+
+# Joins transcript messages for a single scan. No pattern can match across
+# it: "." stops at newlines and NUL is neither a word nor a space character.
+_MESSAGE_SEPARATOR = "\n\0\n"
+
+# Word tokens for similarity checks
+_WORD_RE = re.compile(r"\w+")
+
 # Subject taxonomy prefixes
 VALID_PREFIXES = ("user.", "self.", "project.", "knowledge.", "meta.")
 
+# Categorization keywords, in priority order
+CATEGORY_KEYWORDS = (
+    ("user.preference", ("prefer", "like", "want", "favorite")),
+    ("user.identity", ("name is", "i am", "i'm a")),
+    ("project.info", ("project", "codebase", "repository")),
+    ("meta.note", ("remember", "don't forget", "note that")),
+)
+
+# All keywords in one regex, so content is scanned once; each keyword maps
+# to the priority rank of its category
+_KEYWORD_RANKS = {word: rank for rank, (_, words) in enumerate(CATEGORY_KEYWORDS) for word in words}
+_KEYWORD_RE = re.compile("|".join(re.escape(word) for word in _KEYWORD_RANKS))
+
 
 class MemoryExtractor:
     """
@@ -83,29 +142,7 @@ class MemoryExtractor:
         Returns:
             List of extracted memories.
         """
-        memories: list[ExtractedMemory] = []
-
-        for subject, patterns in EXTRACTION_PATTERNS.items():
-            for pattern in patterns:
-                matches = re.finditer(pattern, text, re.IGNORECASE | re.MULTILINE)
-                for match in matches:
-                    content = match.group(1).strip() if match.groups() else match.group(0).strip()
-
-                    # Skip very short or very long matches
-                    if len(content) < 5 or len(content) > 500:
-                        continue
-
-                    # Calculate confidence based on pattern specificity
-                    confidence = self._calculate_confidence(subject, content)
-
-                    if confidence >= self._min_confidence:
-                        memories.append(
-                            ExtractedMemory(
-                                subject=subject,
-                                content=content,
-                                confidence=confidence,
-                            )
-                        )
+        memories = [mem for _, mem in self._scan(text)]
 
         # Deduplicate similar memories
         return self._deduplicate(memories)
@@ -120,26 +157,72 @@ class MemoryExtractor:
         Returns:
             List of extracted memories.
         """
-        memories: list[ExtractedMemory] = []
+        messages = [msg for msg in transcript if msg.get("content", "")]
 
-        for msg in transcript:
-            role = msg.get("role", "")
-            content = msg.get("content", "")
+        # Scan all messages in one pass, then map each match back to its
+        # message through the start offsets
+        starts: list[int] = []
+        offset = 0
+        for msg in messages:
+            starts.append(offset)
+            offset += len(msg["content"]) + len(_MESSAGE_SEPARATOR)
 
-            if not content:
-                continue
+        joined = _MESSAGE_SEPARATOR.join(msg["content"] for msg in messages)
+        per_message: list[list[ExtractedMemory]] = [[] for _ in messages]
+        for start, mem in self._scan(joined):
+            per_message[bisect_right(starts, start) - 1].append(mem)
 
+        memories: list[ExtractedMemory] = []
+        for msg, extracted in zip(messages, per_message, strict=True):
             # Higher confidence for user messages (direct statements)
-            base_confidence = 0.9 if role == "user" else 0.7
+            base_confidence = 0.9 if msg.get("role", "") == "user" else 0.7
 
-            extracted = self.extract_from_text(content)
-            for mem in extracted:
-                mem.confidence *= base_confidence
-                if mem.confidence >= self._min_confidence:
-                    memories.append(mem)
+            for mem in self._deduplicate(extracted):
+                confidence = mem.confidence * base_confidence
+                if confidence >= self._min_confidence:
+                    memories.append(replace(mem, confidence=confidence))
 
         return self._deduplicate(memories)
 
+    def _scan(self, text: str) -> Iterator[tuple[int, ExtractedMemory]]:
+        """
+        Run the extraction patterns over text.
+
+        Args:
+            text: Text to scan.
+
+        Yields:
+            Match start offset and memory for each confident match, grouped
+            by subject and pattern in EXTRACTION_PATTERNS order.
+        """
+        # Most messages contain no trigger keyword at all
+        if not _TRIGGER_RE.search(text):
+            return
+
+        for subject, patterns in _COMPILED_PATTERNS.items():
+            for pattern in patterns:
+                for match in pattern.finditer(text):
+                    content = match.group(1).strip() if match.groups() else match.group(0).strip()
+
+                    # Skip very short or very long matches
+                    if len(content) < 5 or len(content) > 500:
+                        continue
+
+                    # Calculate confidence based on pattern specificity
+                    content_lower = content.lower()
+                    confidence = self._calculate_confidence(subject, content, content_lower)
+
+                    if confidence >= self._min_confidence:
+                        yield (
+                            match.start(),
+                            ExtractedMemory(
+                                subject=subject,
+                                content=content,
+                                confidence=confidence,
+                                content_lower=content_lower,
+                            ),
+                        )
+
     def categorize_memory(self, content: str, hint: str = "") -> str:
         """
         Categorize a piece of content into the subject taxonomy.
@@ -151,32 +234,27 @@ class MemoryExtractor:
         Returns:
             Subject string (e.g., 'user.preference').
         """
-        content_lower = content.lower()
-
         # Check for explicit hints
-        if hint:
-            for prefix in VALID_PREFIXES:
-                if hint.startswith(prefix):
-                    return hint
-
-        # Categorization heuristics
-        if any(word in content_lower for word in ["prefer", "like", "want", "favorite"]):
-            return "user.preference"
+        if hint and hint.startswith(VALID_PREFIXES):
+            return hint
 
-        if any(word in content_lower for word in ["name is", "i am", "i'm a"]):
-            return "user.identity"
+        content_lower = content.lower()
 
-        if any(word in content_lower for word in ["project", "codebase", "repository"]):
-            return "project.info"
+        # Categorization heuristics: highest-priority category with a keyword present
+        best_rank = len(CATEGORY_KEYWORDS)
+        for match in _KEYWORD_RE.finditer(content_lower):
+            best_rank = min(best_rank, _KEYWORD_RANKS[match.group(0)])
+            if best_rank == 0:
+                break
 
-        if any(word in content_lower for word in ["remember", "don't forget", "note that"]):
-            return "meta.note"
+        if best_rank < len(CATEGORY_KEYWORDS):
+            return CATEGORY_KEYWORDS[best_rank][0]
 
         # Default to general knowledge
         return "knowledge.general"
 
-    def _calculate_confidence(self, subject: str, content: str) -> float:
-        """Calculate confidence score for an extraction."""
+    def _calculate_confidence(self, subject: str, content: str, content_lower: str) -> float:
+        """Calculate confidence score for an extraction from its content and lowercased content."""
         base_confidence = 0.7
 
         # Boost confidence for specific patterns
@@ -192,7 +270,7 @@ class MemoryExtractor:
 
         # Reduce confidence for content with uncertainty
         uncertainty_words = ["maybe", "perhaps", "might", "could", "possibly"]
-        if any(word in content.lower() for word in uncertainty_words):
+        if any(word in content_lower for word in uncertainty_words):
             base_confidence -= 0.2
 
         return max(0.1, min(1.0, base_confidence))
@@ -205,24 +283,27 @@ class MemoryExtractor:
         unique: list[ExtractedMemory] = []
         seen_content: set[str] = set()
 
+        # All kept content joined by NULs, so "is this a substring of
+        # anything seen" is a single C-level search instead of a loop
+        haystack = ""
+
         for mem in memories:
             # Normalize content for comparison
-            normalized = mem.content.lower().strip()
+            normalized = mem.content_lower.strip()
 
             # Check for exact duplicates
             if normalized in seen_content:
                 continue
 
-            # Check for substring matches
-            is_substring = False
-            for seen in seen_content:
-                if normalized in seen or seen in normalized:
-                    is_substring = True
-                    break
+            # Check for substring matches in either direction
+            if seen_content and normalized in haystack:
+                continue
+            if any(seen in normalized for seen in seen_content):
+                continue
 
-            if not is_substring:
-                unique.append(mem)
-                seen_content.add(normalized)
+            unique.append(mem)
+            seen_content.add(normalized)
+            haystack += "\0" + normalized
 
         return unique
 
@@ -245,7 +326,7 @@ class MemoryExtractor:
 
         new_memories = []
         for mem in extracted:
-            normalized = mem.content.lower().strip()
+            normalized = mem.content_lower.strip()
             if normalized not in existing_content:
                 # Also check for high similarity
                 is_similar = False
@@ -263,8 +344,8 @@ class MemoryExtractor:
         if not a or not b:
             return False
 
-        words_a = set(a.split())
-        words_b = set(b.split())
+        words_a = set(_WORD_RE.findall(a))
+        words_b = set(_WORD_RE.findall(b))
 
         if not words_a or not words_b:
             return False
@@ -4,8 +4,11 @@ Memory pruner service.
 Removes stale or low-value memories based on scoring criteria.
 """
 
+import heapq
+import re
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import UTC, datetime
+from functools import lru_cache
 
 
 @dataclass
@@ -16,7 +19,19 @@ class PruneResult:
     pruned_count: int = 0
     archived_count: int = 0
     retained_count: int = 0
-    pruned_memories: list[dict] = field(default_factory=list)
+
+    # Pruned memory log as parallel columns, one entry per pruned memory
+    pruned_ids: list[str] = field(default_factory=list)
+    pruned_subjects: list[str] = field(default_factory=list)
+    pruned_scores: list[float] = field(default_factory=list)
+
+    @property
+    def pruned_memories(self) -> list[dict]:
+        """Pruned memories as dicts with id, subject and score."""
+        return [
+            {"id": memory_id, "subject": subject, "score": score}
+            for memory_id, subject, score in zip(self.pruned_ids, self.pruned_subjects, self.pruned_scores, strict=True)
+        ]
 
     @property
     def pruned_percent(self) -> float:
@@ -26,6 +41,12 @@ class PruneResult:
         return (self.pruned_count / self.total_count) * 100
 
 
+# Weights of the component scores in a memory's total score
+RECENCY_WEIGHT = 0.4
+ACCESS_WEIGHT = 0.3
+RELEVANCE_WEIGHT = 0.3
+
+
 @dataclass
 class MemoryScore:
     """Score breakdown for a memory."""
@@ -38,9 +59,9 @@ class MemoryScore:
 
     def calculate_total(
         self,
-        recency_weight: float = 0.4,
-        access_weight: float = 0.3,
-        relevance_weight: float = 0.3,
+        recency_weight: float = RECENCY_WEIGHT,
+        access_weight: float = ACCESS_WEIGHT,
+        relevance_weight: float = RELEVANCE_WEIGHT,
     ) -> float:
         """Calculate weighted total score."""
         self.total_score = (
@@ -66,6 +87,73 @@ EPHEMERAL_PREFIXES = (
     "project.temp",
 )
 
+# Relevance score by subject prefix, highest tier first
+RELEVANCE_TIERS = (
+    (1.0, ("user.identity", "self.identity", "self.protocol")),  # High relevance
+    (0.8, ("user.preference", "self.trait", "project.info")),  # Medium-high relevance
+    (0.6, ("knowledge.", "self.")),  # Medium relevance
+    (0.4, ("meta.", "project.temp")),  # Lower relevance
+)
+
+
+def _prefix_pattern(prefixes: tuple[str, ...]) -> str:
+    """Build a regex alternation matching any of the prefixes literally."""
+    return "|".join(re.escape(prefix) for prefix in prefixes)
+
+
+# Prefix checks compiled once; use .match() so they anchor at the start
+_PROTECTED_RE = re.compile(_prefix_pattern(PROTECTED_PREFIXES))
+_EPHEMERAL_RE = re.compile(_prefix_pattern(EPHEMERAL_PREFIXES))
+
+
+def _build_relevance_table() -> dict[str, list[tuple[str, float]]]:
+    """
+    Build the relevance dispatch table from RELEVANCE_TIERS.
+
+    Maps a root segment to its (prefix, score) pairs in tier order. Every
+    prefix has a dot, so only prefixes sharing a subject's root can match.
+    """
+    table: dict[str, list[tuple[str, float]]] = {}
+    for score, prefixes in RELEVANCE_TIERS:
+        for prefix in prefixes:
+            table.setdefault(prefix.partition(".")[0], []).append((prefix, score))
+    return table
+
+
+_RELEVANCE_BY_ROOT = _build_relevance_table()
+
+
+@lru_cache(maxsize=4096)
+def _relevance_for(subject: str) -> float:
+    """Get the relevance score for a subject; subjects repeat a lot, so it's cached."""
+    for prefix, score in _RELEVANCE_BY_ROOT.get(subject.partition(".")[0], ()):
+        if subject.startswith(prefix):
+            return score
+
+    # Default
+    return 0.5
+
+
+def _access_score(access_count: int) -> float:
+    """Calculate access score from an access count."""
+    if access_count <= 0:
+        return 0.3  # Low score for never-accessed
+
+    if access_count >= 10:
+        return 1.0  # Max score for frequently accessed
+
+    # Scale from 0.3 to 1.0
+    return 0.3 + (access_count / 10) * 0.7
+
+
+@lru_cache(maxsize=8192)
+def _parse_iso(timestamp: str) -> datetime | None:
+    """Parse an ISO 8601 timestamp, or None if it isn't one."""
+    try:
+        return datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
 
 class MemoryPruner:
     """
@@ -114,34 +202,20 @@ class MemoryPruner:
             return [], [], result
 
         # Score all memories
-        scores = [self.score_memory(mem) for mem in memories]
+        scores = self._score_batch(memories)
 
         # Separate retained and pruned
         retained: list[dict] = []
         pruned: list[dict] = []
 
-        for mem, score in zip(memories, scores, strict=True):
-            subject = mem.get("subject", "")
-
-            # Protected subjects get a score boost
-            if subject.startswith(PROTECTED_PREFIXES):
-                score.total_score = min(1.0, score.total_score + 0.3)
-
-            # Ephemeral subjects get a score penalty
-            if subject.startswith(EPHEMERAL_PREFIXES):
-                score.total_score = max(0.0, score.total_score - 0.2)
-
-            if score.total_score >= self._prune_threshold:
+        for mem, total in zip(memories, scores, strict=True):
+            if total >= self._prune_threshold:
                 retained.append(mem)
             else:
                 pruned.append(mem)
-                result.pruned_memories.append(
-                    {
-                        "id": mem.get("id", ""),
-                        "subject": subject,
-                        "score": score.total_score,
-                    }
-                )
+                result.pruned_ids.append(mem.get("id", ""))
+                result.pruned_subjects.append(mem.get("subject", ""))
+                result.pruned_scores.append(total)
 
         result.retained_count = len(retained)
         result.pruned_count = len(pruned)
@@ -175,6 +249,70 @@ class MemoryPruner:
 
         return score
 
+    def _score_batch(self, memories: list[dict]) -> list[float]:
+        """
+        Calculate total scores for many memories, subject modifiers included.
+
+        Same scores as score_memory plus the prune() modifiers, computed in
+        one pass with the clock read once for the whole batch.
+
+        Args:
+            memories: List of memory dicts.
+
+        Returns:
+            Total score per memory, in input order.
+        """
+        now = datetime.now()
+        now_utc = datetime.now(UTC)
+        recency_at = self._recency_at
+
+        # The clock is fixed for the batch, so each distinct created_at
+        # string is parsed and aged once
+        recency_by_timestamp: dict[str, float] = {}
+
+        # Subjects come from a small vocabulary: classify each distinct one
+        # once, as (relevance, protected, ephemeral)
+        subject_profiles: dict[str, tuple[float, bool, bool]] = {}
+
+        totals: list[float] = []
+        append = totals.append
+        for mem in memories:
+            # Recency score (1.0 for new, decays over time)
+            created_at = mem.get("created_at")
+            if isinstance(created_at, str):
+                recency = recency_by_timestamp.get(created_at)
+                if recency is None:
+                    recency = recency_at(_parse_iso(created_at) if created_at else None, now, now_utc)
+                    recency_by_timestamp[created_at] = recency
+            else:
+                recency = recency_at(created_at, now, now_utc)
+
+            # Access score (based on access_count if available)
+            access = _access_score(mem.get("access_count", 0))
+
+            # Weighted total, as in MemoryScore.calculate_total
+            subject = mem.get("subject", "")
+            profile = subject_profiles.get(subject)
+            if profile is None:
+                profile = (
+                    _relevance_for(subject),
+                    _PROTECTED_RE.match(subject) is not None,
+                    _EPHEMERAL_RE.match(subject) is not None,
+                )
+                subject_profiles[subject] = profile
+            relevance, protected, ephemeral = profile
+            total = recency * RECENCY_WEIGHT + access * ACCESS_WEIGHT + relevance * RELEVANCE_WEIGHT
+
+            # Protected subjects get a score boost, ephemeral ones a penalty
+            if protected:
+                total = min(1.0, total + 0.3)
+            if ephemeral:
+                total = max(0.0, total - 0.2)
+
+            append(total)
+
+        return totals
+
     def get_prune_candidates(
         self,
         memories: list[dict],
@@ -192,10 +330,8 @@ class MemoryPruner:
         """
         scored = [(mem, self.score_memory(mem)) for mem in memories]
 
-        # Sort by total score ascending (lowest first)
-        scored.sort(key=lambda x: x[1].total_score)
-
-        return scored[:limit]
+        # Lowest scores first; same order as a stable sort, O(N log limit)
+        return heapq.nsmallest(limit, scored, key=lambda x: x[1].total_score)
 
     def should_prune(self, memory: dict) -> bool:
         """
@@ -207,37 +343,36 @@ class MemoryPruner:
         Returns:
             True if memory should be pruned.
         """
-        score = self.score_memory(memory)
-        subject = memory.get("subject", "")
-
-        # Apply subject modifiers
-        if subject.startswith(PROTECTED_PREFIXES):
-            score.total_score = min(1.0, score.total_score + 0.3)
-        if subject.startswith(EPHEMERAL_PREFIXES):
-            score.total_score = max(0.0, score.total_score - 0.2)
-
-        return score.total_score < self._prune_threshold
+        # Same kernel as prune(), subject modifiers included
+        return self._score_batch([memory])[0] < self._prune_threshold
 
     def _calculate_recency_score(self, memory: dict) -> float:
         """Calculate recency score based on created_at."""
         created_at = memory.get("created_at")
 
-        if not created_at:
-            return 0.5  # Default for unknown age
-
         # Parse datetime if string
-        if isinstance(created_at, str):
-            try:
-                created_at = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
-            except ValueError:
-                return 0.5
+        if created_at and isinstance(created_at, str):
+            created_at = _parse_iso(created_at)
 
+        return self._recency_at(created_at, datetime.now(), datetime.now(UTC))
+
+    def _recency_at(self, created_at: object, now: datetime, now_utc: datetime) -> float:
+        """
+        Calculate recency score for a parsed created_at value.
+
+        Args:
+            created_at: Creation time; anything but a datetime counts as unknown age.
+            now: Current local time, for naive datetimes.
+            now_utc: Current UTC time, for aware datetimes.
+
+        Returns:
+            Recency score between 0.1 and 1.0.
+        """
         if not isinstance(created_at, datetime):
-            return 0.5
+            return 0.5  # Default for unknown age
 
         # Calculate age in days
-        now = datetime.now(created_at.tzinfo) if created_at.tzinfo else datetime.now()
-        age_days = (now - created_at).days
+        age_days = ((now_utc if created_at.tzinfo else now) - created_at).days
 
         if age_days <= 0:
             return 1.0
@@ -249,39 +384,11 @@ class MemoryPruner:
 
     def _calculate_access_score(self, memory: dict) -> float:
         """Calculate access score based on access_count."""
-        access_count = memory.get("access_count", 0)
-
-        if access_count <= 0:
-            return 0.3  # Low score for never-accessed
-
-        if access_count >= 10:
-            return 1.0  # Max score for frequently accessed
-
-        # Scale from 0.3 to 1.0
-        return 0.3 + (access_count / 10) * 0.7
+        return _access_score(memory.get("access_count", 0))
 
     def _calculate_relevance_score(self, memory: dict) -> float:
         """Calculate relevance score based on subject."""
-        subject = memory.get("subject", "")
-
-        # High relevance subjects
-        if subject.startswith(("user.identity", "self.identity", "self.protocol")):
-            return 1.0
-
-        # Medium-high relevance
-        if subject.startswith(("user.preference", "self.trait", "project.info")):
-            return 0.8
-
-        # Medium relevance
-        if subject.startswith(("knowledge.", "self.")):
-            return 0.6
-
-        # Lower relevance
-        if subject.startswith(("meta.", "project.temp")):
-            return 0.4
-
-        # Default
-        return 0.5
+        return _relevance_for(memory.get("subject", ""))
 
     def estimate_savings(
         self,
@@ -298,7 +405,14 @@ class MemoryPruner:
         Returns:
             Dict with savings estimates.
         """
-        _, pruned, result = self.prune(memories, archive=False)
+        # Only the counts are needed, so skip partitioning the memories
+        threshold = self._prune_threshold
+        prune_count = sum(1 for total in self._score_batch(memories) if total < threshold)
+        result = PruneResult(
+            total_count=len(memories),
+            pruned_count=prune_count,
+            retained_count=len(memories) - prune_count,
+        )
 
         return {
             "total_count": result.total_count,
@@ -5,7 +5,10 @@ Builds LLM instruction prompts from persona memories for use in
 session start hooks and persona display.
 """
 
-from datetime import datetime
+import re
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
 
 from personality.schemas.pcart import Cartridge
 from personality.schemas.training import TrainingMemory
@@ -32,6 +35,12 @@ CATEGORY_TITLES = {
 # Persona-related subject prefixes
 PERSONA_PREFIXES = ("self.", "identity.", "user.", "meta.")
 
+# Greeting template placeholders, substituted in a single pass
+_GREETING_PLACEHOLDER_RE = re.compile(r"\{\{(USER_ID|user|TIME_GREETING)\}\}")
+
+# Last time greeting and the epoch time it stays valid until
+_time_greeting_cache: tuple[str, float] = ("", 0.0)
+
 
 class PersonaBuilder:
     """
@@ -60,13 +69,10 @@ class PersonaBuilder:
             return ""
 
         # Group memories by top-level subject
-        groups: dict[str, list[TrainingMemory]] = {}
+        groups: defaultdict[str, list[TrainingMemory]] = defaultdict(list)
         for mem in memories:
-            parts = mem.subject.split(".")
-            category = parts[0] if parts else "other"
-
-            if category not in groups:
-                groups[category] = []
+            # partition stops at the first dot and builds no list
+            category = mem.subject.partition(".")[0]
             groups[category].append(mem)
 
         lines = ["## Your Character\n\n"]
@@ -95,15 +101,13 @@ class PersonaBuilder:
         # Format user.* memories (how to address user, etc.)
         if "user" in groups:
             lines.append("\n### User Interaction\n\n")
-            for mem in groups["user"]:
-                lines.append(f"- {mem.content}\n")
+            lines.append(_format_bullets(groups["user"]))
             del groups["user"]
 
         # Format meta if present
         if "meta" in groups:
             lines.append("\n### Meta Information\n\n")
-            for mem in groups["meta"]:
-                lines.append(f"- {mem.content}\n")
+            lines.append(_format_bullets(groups["meta"]))
             del groups["meta"]
 
         # Format any remaining groups (except identity which is in header)
@@ -113,8 +117,7 @@ class PersonaBuilder:
         for category, mems in sorted(groups.items()):
             title = CATEGORY_TITLES.get(category, category.title())
             lines.append(f"\n### {title}\n\n")
-            for mem in mems:
-                lines.append(f"- {mem.content}\n")
+            lines.append(_format_bullets(mems))
 
         return "".join(lines)
 
@@ -132,12 +135,10 @@ class PersonaBuilder:
         lines: list[str] = []
 
         # Sub-group by second level (trait, belief, speech, etc.)
-        self_groups: dict[str, list[TrainingMemory]] = {}
+        self_groups: defaultdict[str, list[TrainingMemory]] = defaultdict(list)
         for mem in memories:
-            parts = mem.subject.split(".")
-            sub_category = parts[1] if len(parts) > 1 else "general"
-            if sub_category not in self_groups:
-                self_groups[sub_category] = []
+            _, sep, rest = mem.subject.partition(".")
+            sub_category = rest.partition(".")[0] if sep else "general"
             self_groups[sub_category].append(mem)
 
         # Define preferred order for sections
@@ -165,8 +166,7 @@ class PersonaBuilder:
             if sub_cat in self_groups:
                 title = CATEGORY_TITLES.get(sub_cat, sub_cat.title())
                 lines.append(f"\n### {title}\n\n")
-                for mem in self_groups[sub_cat]:
-                    lines.append(f"- {mem.content}\n")
+                lines.append(_format_bullets(self_groups[sub_cat]))
                 seen.add(sub_cat)
 
         # Format any remaining sub-categories
@@ -174,8 +174,7 @@ class PersonaBuilder:
             if sub_cat not in seen:
                 title = CATEGORY_TITLES.get(sub_cat, sub_cat.title())
                 lines.append(f"\n### {title}\n\n")
-                for mem in mems:
-                    lines.append(f"- {mem.content}\n")
+                lines.append(_format_bullets(mems))
 
         return lines
 
@@ -196,24 +195,23 @@ class PersonaBuilder:
             Greeting message.
         """
         # Find greeting in memories
-        greeting_template = None
-        for mem in cart.persona.memories:
-            if "greeting" in mem.subject.lower() or "salutation" in mem.subject.lower():
-                greeting_template = mem.content
-                break
+        greeting_template = cart.persona.greeting_template
 
         if not greeting_template:
             # Default greeting based on identity
             name = cart.preferences.identity.name or cart.tag
             return f"Hello, I am {name}."
 
-        # Replace placeholders
-        greeting = greeting_template
-        greeting = greeting.replace("{{USER_ID}}", user_name or "User")
-        greeting = greeting.replace("{{user}}", user_name or "User")
-        greeting = greeting.replace("{{TIME_GREETING}}", _get_time_greeting())
+        if "{{" not in greeting_template:
+            return greeting_template
 
-        return greeting
+        # Replace placeholders
+        substitutions = {
+            "USER_ID": user_name or "User",
+            "user": user_name or "User",
+            "TIME_GREETING": _get_time_greeting(),
+        }
+        return _GREETING_PLACEHOLDER_RE.sub(lambda m: substitutions[m.group(1)], greeting_template)
 
     @staticmethod
     def build_summary(cart: Cartridge) -> str:
@@ -243,12 +241,32 @@ class PersonaBuilder:
         return " ".join(parts) if parts else "Persona loaded"
 
 
+def _format_bullets(memories: list[TrainingMemory]) -> str:
+    """Format memories as a markdown bullet list, one line per memory."""
+    if not memories:
+        return ""
+    return "- " + "\n- ".join(mem.content for mem in memories) + "\n"
+
+
 def _get_time_greeting() -> str:
-    """Get time-appropriate greeting."""
-    hour = datetime.now().hour
+    """Get time-appropriate greeting, cached until the top of the next hour."""
+    global _time_greeting_cache
+
+    now = time.time()
+    greeting, expires_at = _time_greeting_cache
+    if now < expires_at:
+        return greeting
+
+    current = datetime.fromtimestamp(now)
+    hour = current.hour
     if hour < 12:
-        return "Good morning"
+        greeting = "Good morning"
     elif hour < 17:
-        return "Good afternoon"
+        greeting = "Good afternoon"
     else:
-        return "Good evening"
+        greeting = "Good evening"
+
+    # The greeting can only change on an hour boundary
+    next_hour = current.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+    _time_greeting_cache = (greeting, next_hour.timestamp())
+    return greeting
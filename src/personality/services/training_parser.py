@@ -5,7 +5,10 @@ Parses YAML and JSON-LD training files to extract memories.
 """
 
 import json
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from typing import IO, Any
 
 import yaml
 
@@ -14,6 +17,29 @@ from personality.schemas.training import (
     TrainingMemory,
 )
 
+# Directories with at least this many training files are parsed in worker
+# processes; below that, starting the pool costs more than it saves
+PARALLEL_MIN_FILES = 4
+
+# Prefer the libyaml-backed loader; type[Any] lets either branch assign cleanly
+_YamlLoader: type[Any]
+try:
+    _YamlLoader = yaml.CSafeLoader
+except AttributeError:  # PyYAML built without libyaml
+    _YamlLoader = yaml.SafeLoader
+
+try:
+    import orjson
+except ImportError:  # optional speedup, fall back to the stdlib
+    orjson = None  # type: ignore[assignment]
+
+
+def _json_loads(content: str | bytes) -> Any:
+    """Parse JSON, raising json.JSONDecodeError on invalid input."""
+    if orjson is not None:
+        return orjson.loads(content)  # orjson.JSONDecodeError subclasses json.JSONDecodeError
+    return json.loads(content)
+
 
 class TrainingParser:
     """
@@ -36,16 +62,34 @@ class TrainingParser:
             FileNotFoundError: If file doesn't exist.
             ValueError: If file format is unsupported.
         """
-        if not path.exists():
-            raise FileNotFoundError(f"Training file not found: {path}")
+        try:
+            stat = path.stat()
+        except OSError:
+            raise FileNotFoundError(f"Training file not found: {path}") from None
+
+        # Re-parse only when the file changed; copy so callers can't alter the cached document
+        doc = _parse_cached(path, stat.st_mtime_ns, stat.st_size)
+        return doc.model_copy(deep=True)
+
+    @staticmethod
+    def _parse_path(path: Path) -> TrainingDocument:
+        """
+        Read and parse a training file, bypassing the cache.
+
+        Args:
+            path: Path to the training file.
 
+        Returns:
+            TrainingDocument with parsed memories.
+        """
         suffix = path.suffix.lower()
-        content = path.read_text(encoding="utf-8")
 
+        # Hand the parsers raw bytes rather than a decoded copy of the file
         if suffix in (".yml", ".yaml"):
-            tag, version, memories, preferences = self._parse_yaml(content)
+            with path.open("rb") as fh:
+                tag, version, memories, preferences = TrainingParser._parse_yaml(fh)
         elif suffix in (".jsonld", ".json"):
-            tag, version, memories, preferences = self._parse_jsonld(content)
+            tag, version, memories, preferences = TrainingParser._parse_jsonld(path.read_bytes())
         else:
             raise ValueError(f"Unsupported file format: {suffix}")
 
@@ -58,7 +102,8 @@ class TrainingParser:
             preferences=preferences,
         )
 
-    def _parse_yaml(self, content: str) -> tuple[str, str, list[TrainingMemory], dict]:
+    @staticmethod
+    def _parse_yaml(content: str | IO[bytes]) -> tuple[str, str, list[TrainingMemory], dict]:
         """
         Parse YAML training content.
 
@@ -80,13 +125,13 @@ class TrainingParser:
         ```
 
         Args:
-            content: YAML content string.
+            content: YAML content string or binary stream.
 
         Returns:
             Tuple of (tag, version, memories, preferences).
         """
         try:
-            data = yaml.safe_load(content)
+            data = yaml.load(content, Loader=_YamlLoader)
         except yaml.YAMLError as e:
             raise ValueError(f"Invalid YAML: {e}") from e
 
@@ -136,7 +181,8 @@ class TrainingParser:
 
         return tag, version, memories, preferences
 
-    def _parse_jsonld(self, content: str) -> tuple[str, str, list[TrainingMemory], dict]:
+    @staticmethod
+    def _parse_jsonld(content: str | bytes) -> tuple[str, str, list[TrainingMemory], dict]:
         """
         Parse JSON-LD training content.
 
@@ -157,13 +203,13 @@ class TrainingParser:
         ```
 
         Args:
-            content: JSON-LD content string.
+            content: JSON-LD content as a string or UTF-8 bytes.
 
         Returns:
             Tuple of (tag, version, memories, preferences).
         """
         try:
-            data = json.loads(content)
+            data = _json_loads(content)
         except json.JSONDecodeError as e:
             raise ValueError(f"Invalid JSON-LD: {e}") from e
 
@@ -246,6 +292,30 @@ class TrainingParser:
 
         return sorted(files, key=lambda p: p.stem.lower())
 
+    def parse_directory(self, directory: Path, max_workers: int | None = None) -> list[TrainingDocument]:
+        """
+        Parse all training files in a directory.
+
+        YAML parsing is CPU-bound and holds the GIL, so larger directories
+        are parsed in a process pool rather than threads.
+
+        Args:
+            directory: Directory to scan.
+            max_workers: Worker process limit (default: CPU count).
+
+        Returns:
+            Parsed documents, in list_training_files order.
+
+        Raises:
+            ValueError: If a file can't be parsed.
+        """
+        files = self.list_training_files(directory)
+        if len(files) < PARALLEL_MIN_FILES:
+            return [self.parse_file(path) for path in files]
+
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(self.parse_file, files))
+
     def validate_file(self, path: Path) -> tuple[bool, str]:
         """
         Validate a training file.
@@ -267,3 +337,14 @@ class TrainingParser:
             return False, str(e)
         except Exception as e:
             return False, f"Unexpected error: {e}"
+
+
+@lru_cache(maxsize=128)
+def _parse_cached(path: Path, mtime_ns: int, size: int) -> TrainingDocument:
+    """
+    Parse a training file, cached by path and stat signature.
+
+    mtime_ns and size are only part of the cache key: a modified file
+    misses the cache and is parsed again.
+    """
+    return TrainingParser._parse_path(path)